@@ -0,0 +1,28 @@
+from time import perf_counter
+from typing import Callable
+
+RESULTS: dict[str, float] = {}
+
+def timeit(func: Callable[[], object], number: int = 1, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, perf_counter() - start)
+    return best / number
+
+def report(name: str, seconds: float, count: int = 1):
+    per = seconds / count
+    RESULTS[name] = per
+    if per < 1e-6:
+        print(f"{name:<48}{per * 1e9:>12.1f} ns")
+    elif per < 1e-3:
+        print(f"{name:<48}{per * 1e6:>12.2f} us")
+    else:
+        print(f"{name:<48}{per * 1e3:>12.2f} ms")
+
+def write_moves(path: str, count: int):
+    with open(path, "w", encoding = "UTF-8") as f:
+        for i in range(count):
+            f.write(f"Move {i}|Normal|Physical|{5 + i % 35}|{i % 250}|{50 + i % 51}|{i % 64}|{'*' if i % 7 == 0 else ''}|CPMK|\n")
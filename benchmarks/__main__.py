@@ -0,0 +1,38 @@
+from argparse import ArgumentParser
+from benchmarks import RESULTS
+from importlib import import_module
+import json
+import platform
+import subprocess
+
+SUITE = ("startup", "pdict", "effectiveness", "levels", "moves", "breeding", "stats", "parse_fraction", "damage", "geometry", "scene", "render")
+
+def commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output = True, text = True, check = True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(old: dict[str, float]):
+    for name, t in RESULTS.items():
+        if name in old:
+            print(f"{name:<48}{old[name] / t:>11.2f}x")
+
+def main():
+    parser = ArgumentParser(prog = "python -m benchmarks")
+    parser.add_argument("names", nargs = "*", default = SUITE)
+    parser.add_argument("--json", help = "write per-item seconds to this file")
+    parser.add_argument("--compare", help = "print speedups against a previous --json file")
+    args = parser.parse_args()
+    for name in args.names:
+        print(f"== {name}")
+        import_module(f"benchmarks.{name}").run()
+    if args.json:
+        with open(args.json, "w", encoding = "UTF-8") as f:
+            json.dump({"commit": commit(), "python": platform.python_version(), "results": RESULTS}, f, indent = 2)
+    if args.compare:
+        with open(args.compare, encoding = "UTF-8") as f:
+            print("== speedup")
+            compare(json.load(f)["results"])
+
+main()
\ No newline at end of file
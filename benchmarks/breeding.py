@@ -0,0 +1,20 @@
+from benchmarks import report, timeit
+import numpy as np
+from objects import BREEDING, GENDERS, GROUPS
+
+BOX = 30_000
+
+def run():
+    rng = np.random.default_rng(0)
+    genders = rng.integers(0, len(GENDERS), BOX)
+    first = rng.integers(0, len(GROUPS), BOX)
+    second = rng.integers(0, len(GROUPS), BOX)
+    masks = (np.uint64(1) << first.astype(np.uint64)) | (np.uint64(1) << second.astype(np.uint64))
+    male, female = GENDERS["Male"], GENDERS["Female"]
+    monster, field = GROUPS["Monster"], GROUPS["Field"]
+    report("BreedingIndex.can_breed", timeit(lambda: BREEDING.can_breed(male, (monster, field), female, (field,)), 10000))
+    report(f"BreedingIndex.partners n={BOX}", timeit(lambda: BREEDING.partners(male, (monster, field), genders, masks), 100))
+    report(f"BreedingIndex.partners n={BOX} (per candidate)", timeit(lambda: BREEDING.partners(male, (monster, field), genders, masks), 100), BOX)
+
+if __name__ == "__main__":
+    run()
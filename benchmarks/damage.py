@@ -0,0 +1,25 @@
+from benchmarks import report, timeit
+import numpy as np
+from objects import damage, MOVE_TABLE, MOVES, TYPES
+
+PAIRS = 1_000_000
+
+def run():
+    rng = np.random.default_rng(0)
+    attackers = rng.integers(5, 500, (PAIRS, 6))
+    defenders = rng.integers(5, 500, (PAIRS, 6))
+    moves = rng.integers(0, len(MOVE_TABLE), PAIRS)
+    defender_types = rng.integers(-1, len(TYPES), (PAIRS, 2))
+    defender_types[:, 0] = rng.integers(0, len(TYPES), PAIRS)
+    attacker_types = rng.integers(0, len(TYPES), (PAIRS, 2))
+    levels = rng.integers(1, 101, PAIRS)
+    seconds = timeit(lambda: damage.calculate(attackers, defenders, moves, defender_types, levels, attacker_types), repeat = 3)
+    report(f"damage.calculate n={PAIRS}", seconds)
+    print(f"{'damage.calculate throughput':<48}{PAIRS / seconds / 1e6:>12.2f} M/s")
+    pound, normal = MOVES["Pound"], TYPES["Normal"]
+    seconds = timeit(lambda: damage.damage([100] * 6, [100] * 6, pound, (normal,), 50, (normal,)), 1000)
+    report("damage.damage (scalar)", seconds)
+    print(f"{'damage.damage throughput':<48}{1 / seconds / 1e3:>12.2f} k/s")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,22 @@
+from benchmarks import report, timeit
+from functools import reduce
+import numpy as np
+from objects import effectiveness, TYPES
+from operator import mul
+
+PAIRS = 1_000_000
+
+def run():
+    a, b, c = TYPES["Fire"], TYPES["Water"], TYPES["Grass"]
+    report("dict reduce (baseline)", timeit(lambda: reduce(mul, map(a.eff.get, (b, c))), 10000))
+    report("PType.effectiveness", timeit(lambda: a.effectiveness(b, c), 10000))
+    rng = np.random.default_rng(0)
+    n = len(TYPES)
+    attackers = rng.integers(0, n, PAIRS)
+    defenders = rng.integers(-1, n, (PAIRS, 2))
+    defenders[:, 0] = rng.integers(0, n, PAIRS)
+    report(f"effectiveness batch n={PAIRS} (per pair)", timeit(lambda: effectiveness(attackers, defenders)), PAIRS)
+    report(f"effectiveness batch n={PAIRS} (total)", timeit(lambda: effectiveness(attackers, defenders)))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,31 @@
+from benchmarks import report, timeit
+from benchmarks.gl import stub_gl
+from math import cos, sin
+import render.geometry as geometry
+
+RESOLUTIONS = (16, 50, 128, 512)
+
+def scalar_sphere(u: float, v: float):
+    return sin(u) * cos(v), sin(v), cos(u) * cos(v)
+
+def upload_bytes(g: geometry.Geometry) -> tuple[int, int]:
+    vertex = g.vertex_buffer.data.nbytes
+    if g.indices is None:
+        return vertex, vertex
+    return vertex * len(g.indices) // g.vertex_count, vertex + g.indices.nbytes
+
+def run():
+    with stub_gl():
+        for g in (geometry.Box(), geometry.Plane(), geometry.Sphere(), geometry.Sphere(ur = 256, vr = 256)):
+            flat, indexed = upload_bytes(g)
+            print(f"{f'{type(g).__name__} bytes indexed/flat v={g.vertex_count}':<48}{indexed:>12} /{flat:>9} ({flat / indexed:.1f}x)")
+        for res in RESOLUTIONS:
+            verts = res * res * 6
+            report(f"Plane      {res}x{res}", timeit(lambda: geometry.Plane(w_sub = res, h_sub = res), repeat = 3))
+            report(f"Sphere     {res}x{res}", timeit(lambda: geometry.Sphere(ur = res, vr = res), repeat = 3))
+            report(f"Sphere     {res}x{res} per vertex", timeit(lambda: geometry.Sphere(ur = res, vr = res), repeat = 3), verts)
+            report(f"Cylinder   res={res}", timeit(lambda: geometry.Cylinder(res = res), repeat = 3))
+            report(f"Parametric {res}x{res} scalar func", timeit(lambda: geometry.Parametric(0, 6.28, res, 0, 6.28, res, scalar_sphere, vectorized = False), repeat = 3))
+
+if __name__ == "__main__":
+    run()
\ No newline at end of file
@@ -0,0 +1,46 @@
+from collections import Counter
+from contextlib import contextmanager
+from itertools import count
+import OpenGL.GL
+import sys
+
+CALLS: Counter[str] = Counter()
+_ONE = {"glGetShaderiv", "glGetProgramiv"}
+
+def _stub(name: str, ids: count):
+    if name.startswith(("glGen", "glCreate", "glGetAttribLocation", "glGetUniformLocation", "glGetUniformBlockIndex")):
+        def f(*args):
+            CALLS[name] += 1
+            return next(ids)
+    elif name in _ONE:
+        def f(*args):
+            CALLS[name] += 1
+            return 1
+    else:
+        def f(*args):
+            CALLS[name] += 1
+    f.__name__ = name
+    return f
+
+@contextmanager
+def stub_gl():
+    ids = count(1)
+    real = {n: v for n, v in vars(OpenGL.GL).items() if n.startswith("gl") and callable(v)}
+    stubs = {n: _stub(n, ids) for n in real}
+    patched = []
+    for m in [OpenGL.GL] + [m for n, m in list(sys.modules.items()) if n == "render" or n.startswith("render.")]:
+        for n, v in vars(m).items():
+            if n in stubs and v is real[n]:
+                patched.append((m, n, v))
+    for m, n, _ in patched:
+        setattr(m, n, stubs[n])
+    CALLS.clear()
+    try:
+        yield CALLS
+    finally:
+        for m, n, v in patched:
+            setattr(m, n, v)
+        if "render.openGL_util" in sys.modules:
+            sys.modules["render.openGL_util"].clear_programs()
+        if "render.materials" in sys.modules:
+            sys.modules["render.materials"].CAMERA.buffer = None
\ No newline at end of file
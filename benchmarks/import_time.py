@@ -0,0 +1,41 @@
+from benchmarks import report
+from glob import glob
+import shutil
+import subprocess
+import sys
+
+CHILD = """
+import objects, time
+t = time.perf_counter()
+for name in {names!r}:
+    getattr(objects, name)
+print(time.perf_counter() - t)
+"""
+
+def import_time(stderr: str, module: str) -> float:
+    for line in stderr.splitlines():
+        _, cumulative, name = line.rsplit("|", 2)
+        if name.strip() == module:
+            return int(cumulative) / 1e6
+    raise ValueError(f"{module} not found in import times")
+
+def measure(*names: str, repeat: int = 5) -> tuple[float, float]:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD.format(names = names)], check = True, capture_output = True, text = True)
+        runs.append((import_time(out.stderr, "objects"), float(out.stdout.splitlines()[-1])))
+    return min(r[0] for r in runs), min(r[1] for r in runs)
+
+def run():
+    for d in glob("pyk/**/__pycache__", recursive = True):
+        shutil.rmtree(d)
+    measure()
+    import objects
+    i, _ = measure()
+    report("import objects", i)
+    for name in objects._REGISTRIES:
+        report(f"first access  objects.{name}", measure(name)[1])
+    report("first access  all registries", measure(*objects._REGISTRIES)[1])
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,26 @@
+from benchmarks import report, timeit
+import numpy as np
+from objects import RATES
+
+ROSTER = 100_000
+
+def linear_level_at(rate, exp: int):
+    level = 1
+    for l, e in rate.exp.items():
+        if e > exp:
+            break
+        level = l
+    return level
+
+def run():
+    rate = RATES["Medium Slow"]
+    exps = np.random.default_rng(0).integers(0, rate.thresholds[-1] + 1, ROSTER)
+    sample = exps[:1000].tolist()
+    report("linear level_at (baseline)", timeit(lambda: [linear_level_at(rate, e) for e in sample], 10), 1000)
+    report("LevelingRate.level_at", timeit(lambda: [rate.level_at(e) for e in sample], 10), 1000)
+    report("LevelingRate.exp_to_next", timeit(lambda: [rate.exp_to_next(e) for e in sample], 10), 1000)
+    report(f"LevelingRate.levels_at n={ROSTER}", timeit(lambda: rate.levels_at(exps), 10), ROSTER)
+    report(f"LevelingRate.exp_to_next_many n={ROSTER}", timeit(lambda: rate.exp_to_next_many(exps), 10), ROSTER)
+
+if __name__ == "__main__":
+    run()
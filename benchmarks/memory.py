@@ -0,0 +1,59 @@
+import os
+from benchmarks import write_moves
+from objects import _objects, CATEGORIES, STATS, TYPES
+from tempfile import TemporaryDirectory
+import tracemalloc
+from typing import Callable
+from util import parse_pyk
+
+COUNT = 50_000
+
+class DictMove:
+    def __init__(self, name: str, ptype: str, category: str, pp: str, power: str, acc: str, target: str, wide: str = None, flags: str = None, additional: str = None):
+        self.name = name
+        self.type = TYPES[ptype]
+        self.category = CATEGORIES[category]
+        self.pp = int(pp)
+        self.power = int(power)
+        self.accuracy = int(acc) / 100
+        self.target = tuple(bool(int(target) >> i & 1) for i in range(5, -1, -1))
+        self.wide = bool(wide)
+        self.flags = list(flags or "")
+        self.additional = additional or ""
+
+def allocated(build) -> int:
+    tracemalloc.start()
+    try:
+        value = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del value
+    return size
+
+def factories() -> dict[str, Callable[[], object]]:
+    keys = tuple(STATS.values())[1:6]
+    return {"PType": lambda: _objects.PType("Fire", "F08030"),
+            "Stat": lambda: _objects.Stat("Attack", "ATK", "F08030"),
+            "Nature": lambda: _objects.Nature("Lonely", "11/10", "9/10", keys = keys),
+            "Gender": lambda: _objects.Gender("Male", "6464FF", "1"),
+            "Group": lambda: _objects.Group("Monster", "D25064"),
+            "LevelingRate": lambda: _objects.LevelingRate("Fast"),
+            "MoveCategory": lambda: _objects.MoveCategory("Physical", "C92112")}
+
+def report(name: str, size: int, count: int, unit: str = "move"):
+    print(f"{name:<48}{size / 2 ** 20:>9.2f} MiB{size / count:>9.1f} B/{unit}")
+
+def run():
+    with TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "moves.pyk")
+        write_moves(path, COUNT)
+        rows = parse_pyk(path)
+    _objects.MoveTable(rows[:1])
+    report(f"dict-backed Move objects n={COUNT}", allocated(lambda: [DictMove(*r) for r in rows]), COUNT)
+    report(f"MoveTable + Move views n={COUNT}", allocated(lambda: _objects.MoveTable(rows)), COUNT)
+    for name, factory in factories().items():
+        report(f"{name} n={COUNT}", allocated(lambda: [factory() for _ in range(COUNT)]), COUNT, "object")
+
+if __name__ == "__main__":
+    run()
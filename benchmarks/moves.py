@@ -0,0 +1,22 @@
+import os
+from benchmarks import report, timeit, write_moves
+from benchmarks.memory import DictMove
+from objects import _objects
+from tempfile import TemporaryDirectory
+from util import parse_pyk
+
+COUNT = 50_000
+
+def run():
+    with TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "moves.pyk")
+        write_moves(path, COUNT)
+        rows = parse_pyk(path)
+    moves = [DictMove(*r) for r in rows]
+    table = _objects.MoveTable(rows)
+    report(f"python loop query n={COUNT} (baseline)", timeit(lambda: [m for m in moves if "C" in m.flags and m.target[2] and m.target[4] and m.power >= 80]))
+    report(f"MoveTable.query n={COUNT}", timeit(lambda: table.query(flags = "C", target = 10, min_power = 80)))
+    report(f"MoveTable.select n={COUNT}", timeit(lambda: table.select(flags = "C", target = 10, min_power = 80)))
+
+if __name__ == "__main__":
+    run()
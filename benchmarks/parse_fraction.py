@@ -0,0 +1,26 @@
+from benchmarks import report, timeit
+from functools import reduce
+from operator import truediv
+from random import Random
+from unicodedata import numeric
+from util import parse_fraction
+
+TYPES = 500
+CELLS = ("1", "1", "1", "1", "2", "½", "0", "¼", "4", "11/10", "9/10")
+
+def uncached(frac: str):
+    if len(frac) == 1:
+        return numeric(frac)
+    else:
+        return reduce(truediv, map(int, frac.translate({8260: "/", 8543: "1/"}).split("/")))
+
+def run():
+    rng = Random(0)
+    table = [[rng.choice(CELLS) for _ in range(TYPES)] for _ in range(TYPES)]
+    cells = TYPES * TYPES
+    report(f"uncached parse {TYPES}x{TYPES} (baseline)", timeit(lambda: [[uncached(c) for c in r] for r in table], repeat = 3), cells)
+    report(f"parse_fraction {TYPES}x{TYPES}", timeit(lambda: [[parse_fraction(c) for c in r] for r in table], repeat = 3), cells)
+    report(f"parse_fraction exact {TYPES}x{TYPES}", timeit(lambda: [[parse_fraction(c, True) for c in r] for r in table], repeat = 3), cells)
+
+if __name__ == "__main__":
+    run()
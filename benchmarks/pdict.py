@@ -0,0 +1,21 @@
+from benchmarks import report, timeit
+from objects import PDict
+from random import Random
+
+SIZES = (10, 100, 1000, 10000, 50000)
+
+def run():
+    rng = Random(0)
+    for size in SIZES:
+        d: PDict[int] = PDict()
+        for i in range(size):
+            d[f"Move {i}"] = i
+        keys = [f"Move {rng.randrange(size)}" for _ in range(1000)]
+        indices = [rng.randrange(size) for _ in range(1000)]
+        d.nth(0)
+        report(f"PDict[key]      n={size}", timeit(lambda: [d[k] for k in keys], 10), 1000)
+        report(f"PDict[missing]  n={size}", timeit(lambda: [d["???"] for _ in keys], 10), 1000)
+        report(f"PDict.nth       n={size}", timeit(lambda: [d.nth(i) for i in indices], 10), 1000)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,41 @@
+from benchmarks import report, timeit
+from benchmarks.gl import stub_gl
+from render.geometry import Box
+from render import Texture
+from render.materials import SurfaceBasicMaterial, TextureMaterial
+from render.objects import Camera, Group, Mesh, Renderer, Scene
+
+SIZES = (10, 100, 1000)
+MATERIALS = 4
+
+def scene(meshes: int) -> tuple[Scene, Camera]:
+    s = Scene()
+    camera = Camera()
+    camera.translate(0, 0, 5)
+    s.add(camera)
+    geometry = Box()
+    materials = [SurfaceBasicMaterial({"useVertexColors": 1}) for _ in range(MATERIALS)]
+    materials += [TextureMaterial(Texture()) for _ in range(MATERIALS)]
+    groups = [Group() for _ in range(10)]
+    for g in groups:
+        s.add(g)
+    for i in range(meshes):
+        m = Mesh(geometry, materials[i % len(materials)])
+        m.translate(i % 10, i // 10 % 10, -i // 100)
+        groups[i % len(groups)].add(m)
+    return s, camera
+
+def run():
+    with stub_gl() as calls:
+        renderer = Renderer()
+        for size in SIZES:
+            s, camera = scene(size)
+            calls.clear()
+            renderer.render(s, camera)
+            per_frame = sum(calls.values())
+            report(f"Renderer.render meshes={size}", timeit(lambda: renderer.render(s, camera), repeat = 3))
+            report(f"Renderer.render meshes={size} per mesh", timeit(lambda: renderer.render(s, camera), repeat = 3), size)
+            print(f"{f'GL calls/frame meshes={size}':<48}{per_frame:>12}")
+
+if __name__ == "__main__":
+    run()
\ No newline at end of file
@@ -0,0 +1,62 @@
+from benchmarks import report, timeit
+from random import Random
+from render.objects import Group, Object3d, Scene
+
+def chain(depth: int) -> list[Object3d]:
+    nodes = [Group()]
+    for _ in range(depth):
+        n = Group()
+        n.translate(1, 0, 0)
+        n.y_rotation(0.1)
+        nodes[-1].add(n)
+        nodes.append(n)
+    return nodes
+
+def tree(count: int, depth: int, seed: int = 0) -> list[Object3d]:
+    rng = Random(seed)
+    levels = [[Group()]]
+    nodes = list(levels[0])
+    per = max(1, (count - 1) // depth)
+    for _ in range(depth):
+        level = []
+        for _ in range(per):
+            n = Group()
+            n.translate(rng.random(), rng.random(), rng.random())
+            n.z_rotation(rng.random())
+            rng.choice(levels[-1]).add(n)
+            level.append(n)
+        levels.append(level)
+        nodes.extend(level)
+    return nodes
+
+def uncached(node: Object3d):
+    if node.parent is None:
+        return node.local_transform
+    return uncached(node.parent) @ node.local_transform
+
+def run():
+    for depth in (10, 100):
+        leaf = chain(depth)[-1]
+        report(f"global_transform chain depth={depth}", timeit(leaf.global_transform, 100))
+    nodes = tree(10_000, 10)
+    n = len(nodes)
+    root = nodes[0]
+    moved = nodes[1::100]
+    report(f"uncached global_transform (baseline) n={n}", timeit(lambda: [uncached(m) for m in nodes], repeat = 3), n)
+    root.update_transforms()
+    report(f"global_transform clean n={n} depth=10", timeit(lambda: [m.global_transform() for m in nodes], repeat = 3), n)
+    report(f"update_transforms clean n={n}", timeit(root.update_transforms, 100))
+    report(f"update_transforms 1% moved n={n}", timeit(lambda: ([m.translate(0, 0, 1) for m in moved], root.update_transforms()), 10))
+    report(f"update_transforms root moved n={n}", timeit(lambda: (root.translate(0, 0, 1), root.update_transforms()), 10))
+    root = nodes[0]
+    report(f"descendants n={len(nodes)}", timeit(root.descendants, 10))
+    scene = Scene(flat = True)
+    scene.add(root)
+    scene.update_transforms()
+    report(f"flat global_transform clean n={n}", timeit(lambda: [m.global_transform() for m in nodes], repeat = 3), n)
+    report(f"flat update_transforms 1% moved n={n}", timeit(lambda: ([m.translate(0, 0, 1) for m in moved], scene.update_transforms()), 10))
+    report(f"flat update_transforms root moved n={n}", timeit(lambda: (root.translate(0, 0, 1), scene.update_transforms()), 10))
+    report(f"flat descendants n={n}", timeit(scene.descendants, 10))
+
+if __name__ == "__main__":
+    run()
\ No newline at end of file
@@ -0,0 +1,15 @@
+import os
+from benchmarks import timeit
+from objects import simulation
+
+BATTLES = 100_000
+
+def run():
+    cores = os.cpu_count() or 1
+    for workers in (1, cores):
+        seconds = timeit(lambda: simulation.simulate(BATTLES, workers = workers), repeat = 3)
+        summary = simulation.simulate(BATTLES, workers = workers)
+        print(f"{f'simulate n={BATTLES} workers={workers}':<48}{BATTLES / seconds / workers:>12.0f} battles/s/core{summary.turns / seconds:>12.0f} turns/s")
+
+if __name__ == "__main__":
+    run()
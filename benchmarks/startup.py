@@ -0,0 +1,39 @@
+import os
+from benchmarks import report, timeit, write_moves
+from glob import glob
+import shutil
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from util import load_pyk, load_pyks, parse_pyk
+
+SIZES = (1000, 10000, 100000)
+FILES = 8
+
+def clear_caches():
+    for d in glob("pyk/**/__pycache__", recursive = True):
+        shutil.rmtree(d)
+
+def import_objects():
+    subprocess.run([sys.executable, "-c", "import objects; objects.load_all(1)"], check = True, stdout = subprocess.DEVNULL)
+
+def run():
+    with TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = os.path.join(tmp, f"moves{size}.pyk")
+            write_moves(path, size)
+            report(f"parse_pyk          rows={size}", timeit(lambda: parse_pyk(path), repeat = 3))
+            load_pyk(path)
+            report(f"load_pyk (warm)    rows={size}", timeit(lambda: load_pyk(path), repeat = 3))
+        paths = [os.path.join(tmp, f"mod{i}.pyk") for i in range(FILES)]
+        for path in paths:
+            write_moves(path, SIZES[-1] // 2)
+        cache = os.path.join(tmp, "__pycache__")
+        for workers in (1, None):
+            report(f"load_pyks {FILES} files workers={workers or 'all'}", timeit(lambda: (shutil.rmtree(cache, True), load_pyks(paths, workers)), repeat = 3))
+    cold = timeit(lambda: (clear_caches(), import_objects()), repeat = 3)
+    report("import objects + load_all (cold)", cold)
+    report("import objects + load_all (warm)", timeit(import_objects, repeat = 3))
+
+if __name__ == "__main__":
+    run()
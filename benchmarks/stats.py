@@ -0,0 +1,18 @@
+from benchmarks import report, timeit
+import numpy as np
+from objects import calc_stats, NATURES
+
+CREATURES = 1_000_000
+
+def run():
+    rng = np.random.default_rng(0)
+    base = rng.integers(5, 256, (CREATURES, 6))
+    levels = rng.integers(1, 101, CREATURES)
+    natures = rng.integers(0, len(NATURES), CREATURES)
+    ivs = rng.integers(0, 32, (CREATURES, 6))
+    evs = rng.integers(0, 253, (CREATURES, 6))
+    report(f"calc_stats n={CREATURES}", timeit(lambda: calc_stats(base, levels, natures, ivs, evs), repeat = 3))
+    report(f"calc_stats n={CREATURES} (per creature)", timeit(lambda: calc_stats(base, levels, natures, ivs, evs), repeat = 3), CREATURES)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,83 @@
+import atexit
+from collections import deque
+import json
+import os
+from time import perf_counter_ns
+
+ENABLED = False
+EVENTS: deque[tuple[str, int, int]] = deque(maxlen = 65536)
+COUNTERS: dict[str, int] = {}
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        EVENTS.append((self.name, self.start, perf_counter_ns() - self.start))
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+_NULL = _NullTimer()
+
+def enable(capacity: int | None = None):
+    global ENABLED, EVENTS
+    if capacity is not None:
+        EVENTS = deque(EVENTS, maxlen = capacity)
+    ENABLED = True
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+def clear():
+    EVENTS.clear()
+    COUNTERS.clear()
+
+def timer(name: str) -> _Timer | _NullTimer:
+    if ENABLED:
+        return _Timer(name)
+    return _NULL
+
+def count(name: str, n: int = 1):
+    if ENABLED:
+        COUNTERS[name] = COUNTERS.get(name, 0) + n
+
+def summary() -> dict[str, dict[str, float]]:
+    s: dict[str, dict[str, float]] = {}
+    for name, _, duration in EVENTS:
+        e = s.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        e["count"] += 1
+        e["total_ms"] += duration / 1e6
+        e["max_ms"] = max(e["max_ms"], duration / 1e6)
+    for e in s.values():
+        e["mean_ms"] = e["total_ms"] / e["count"]
+    return s
+
+def write_json(filename: str):
+    with open(filename, "w", encoding = "UTF-8") as f:
+        json.dump({"timers": summary(), "counters": COUNTERS}, f, indent = 2)
+
+def write_chrome_trace(filename: str):
+    pid = os.getpid()
+    events = [{"name": n, "ph": "X", "ts": s / 1000, "dur": d / 1000, "pid": pid, "tid": 0} for n, s, d in EVENTS]
+    events.extend({"name": n, "ph": "C", "ts": 0, "pid": pid, "args": {n: v}} for n, v in COUNTERS.items())
+    with open(filename, "w", encoding = "UTF-8") as f:
+        json.dump({"traceEvents": events}, f)
+
+if os.environ.get("PYOKKI_TRACE"):
+    enable()
+    atexit.register(write_chrome_trace, os.environ["PYOKKI_TRACE"])
\ No newline at end of file
@@ -1,85 +1,352 @@
 from collections import OrderedDict
+from graphlib import TopologicalSorter
+from instrument import timer
+import numpy as np
 import objects._objects
+import os
+from sys import stderr
 from typing import Generic, TypeVar
-from util import parse_fraction, parse_pyk
+from util import load_pyk, load_pyks, parse_fraction
 
 _VT = TypeVar("_VT")
 class PDict(OrderedDict[str, _VT], Generic[_VT]):
     def __init__(self, **kwargs):
+        self._values: list[_VT] | None = None
         super().__init__(kwargs)
-    
-    def __getitem__(self, item: str):
-        for k, v in self.items():
-            if k == item:
-                return v
+
+    def __missing__(self, key: str) -> _VT:
         return self.nth(0)
-    
+
+    def __setitem__(self, key: str, value: _VT):
+        super().__setitem__(key, value)
+        self._values = None
+
+    def __delitem__(self, key: str):
+        super().__delitem__(key)
+        self._values = None
+
+    def pop(self, *args):
+        self._values = None
+        return super().pop(*args)
+
+    def popitem(self, last: bool = True):
+        self._values = None
+        return super().popitem(last)
+
+    def move_to_end(self, key: str, last: bool = True):
+        self._values = None
+        super().move_to_end(key, last)
+
+    def clear(self):
+        self._values = None
+        super().clear()
+
     def nth(self, n: int) -> _VT:
-        return list(self.values())[n]
-
-TYPES: PDict[_objects.PType] = PDict()
-for t in parse_pyk("pyk/type/ptypes.pyk"):
-    TYPES[t[0]] = _objects.PType(*t)
-l = len(TYPES)
-c = parse_pyk("pyk/type/table.pyk")
-for i in range(l):
-    t = TYPES.nth(i)
-    e = {}
-    for j in range(l):
-        e[TYPES.nth(j)] = parse_fraction(c[i][j])
-    t.eff = e
-
-STATS: PDict[_objects.Stat] = PDict()
-s = parse_pyk("pyk/stats.pyk")
-HEALTH = s[0][1]
-STATS[s[0][1]] = _objects.Stat(*s[0])
-for r in s[1:]:
-    STATS[r[1]] = _objects.Stat(*r)
-
-NATURES: PDict[_objects.Nature] = PDict()
-f = parse_pyk("pyk/natures.pyk")
-k = tuple(map(STATS.get, f[0][1:]))
-for l in f[1:]:
-    NATURES[l[0]] = _objects.Nature(*l, keys = k)
-
-GENDERS: PDict[_objects.Gender] = PDict()
-for g in parse_pyk("pyk/breeding/gender/genders.pyk"):
-    GENDERS[g[0]] = _objects.Gender(*g)
-l = len(GENDERS)
-f = parse_pyk("pyk/breeding/gender/table.pyk")
-for i in range(l):
-    GENDERS.nth(i).compatibilities = {GENDERS.nth(j): bool(f[i][j]) for j in range(l)}
-
-GROUPS: PDict[_objects.Group] = PDict()
-for g in parse_pyk("pyk/breeding/group/groups.pyk"):
-    GROUPS[g[0]] = _objects.Group(*g)
-l = len(GROUPS)
-f = parse_pyk("pyk/breeding/group/table.pyk")
-for i in range(l):
-    GROUPS.nth(i).compatibilities = {GROUPS.nth(j): bool(f[i][j]) for j in range(l)}
-
-RATES: PDict[_objects.LevelingRate] = PDict()
-_f: list[bool] = []
-f = parse_pyk("pyk/levels.pyk")
-for r in f[0]:
-    RATES[r] = _objects.LevelingRate(r)
-    _f.append(True)
-for l in RATES.values():
-    l.exp[1] = 0
-for l in range(1, len(f)):
-    for r in range(len(RATES)):
-        if _f[r]:
-            _f[r] = False
-            try:
-                _f[r] = bool(f[l][r])
-                RATES.nth(r).exp[l + 1] = int(f[l][r])
-            except IndexError:
-                pass
-
-CATEGORIES: PDict[_objects.MoveCategory] = PDict()
-for c in parse_pyk("pyk/categories.pyk"):
-    CATEGORIES[c[0]] = _objects.MoveCategory(*c)
-
-MOVES: PDict[_objects.Move] = PDict()
-for m in parse_pyk("pyk/moves.pyk"):
-    MOVES[m[0]] = _objects.Move(*m)
\ No newline at end of file
+        if self._values is None:
+            self._values = list(self.values())
+        return self._values[n]
+
+TYPES: PDict[_objects.PType]
+TYPE_CHART: np.ndarray
+STATS: PDict[_objects.Stat]
+HEALTH: str
+NATURES: PDict[_objects.Nature]
+NATURE_MATRIX: np.ndarray
+GENDERS: PDict[_objects.Gender]
+GROUPS: PDict[_objects.Group]
+BREEDING: _objects.BreedingIndex
+RATES: PDict[_objects.LevelingRate]
+CATEGORIES: PDict[_objects.MoveCategory]
+MOVE_TABLE: _objects.MoveTable
+MOVES: PDict[_objects.Move]
+
+_STAGED: dict[str, object] = {}
+
+def _get(name: str):
+    return _STAGED[name] if name in _STAGED else _load(name)
+
+def _types(ptypes):
+    types: PDict[_objects.PType] = PDict()
+    for t in ptypes:
+        types[t[0]] = _objects.PType(*t)
+        types[t[0]].id = len(types) - 1
+    return types
+
+def _padded_type_chart(c):
+    l = len(_get("TYPES"))
+    if len(c) != l or any(len(r) != l for r in c):
+        raise ValueError(f"type chart is not {l}x{l}, one row and column per type")
+    chart = np.ones((l, l + 1))
+    for i in range(l):
+        for j in range(l):
+            chart[i, j] = parse_fraction(c[i][j])
+    return chart
+
+def _link_type_chart():
+    types = tuple(TYPES.values())
+    for i, t in enumerate(types):
+        t.chart = _PADDED_TYPE_CHART[i]
+        t.eff = dict(zip(types, _PADDED_TYPE_CHART[i].tolist()))
+
+def _type_chart():
+    return _get("_PADDED_TYPE_CHART")[:, :-1]
+
+def _stats(s):
+    stats: PDict[_objects.Stat] = PDict()
+    for r in s:
+        stats[r[1]] = _objects.Stat(*r)
+    return stats
+
+def _health():
+    return _get("STATS").nth(0).abbr
+
+def _natures(f):
+    natures: PDict[_objects.Nature] = PDict()
+    k = tuple(map(_get("STATS").get, f[0][1:]))
+    for l in f[1:]:
+        natures[l[0]] = _objects.Nature(*l, keys = k)
+        natures[l[0]].id = len(natures) - 1
+    return natures
+
+def _nature_matrix():
+    s = tuple(_get("STATS").values())
+    return np.array([[n.multipliers.get(k, 1) for k in s] for n in _get("NATURES").values()], dtype = float)
+
+def _genders(genders, f):
+    g: PDict[_objects.Gender] = PDict()
+    for r in genders:
+        g[r[0]] = _objects.Gender(*r)
+    l = len(g)
+    for i in range(l):
+        g.nth(i).id = i
+    for i in range(l):
+        g.nth(i).compatibilities = {g.nth(j): bool(f[i][j]) for j in range(l)}
+        g.nth(i).compatible_mask = _objects.id_mask(g.nth(j) for j in range(l) if f[i][j])
+    return g
+
+def _groups(groups, f):
+    g: PDict[_objects.Group] = PDict()
+    for r in groups:
+        g[r[0]] = _objects.Group(*r)
+    l = len(g)
+    for i in range(l):
+        g.nth(i).id = i
+    for i in range(l):
+        g.nth(i).compatibilities = {g.nth(j): bool(f[i][j]) for j in range(l)}
+        g.nth(i).compatible_mask = _objects.id_mask(g.nth(j) for j in range(l) if f[i][j])
+    return g
+
+def _breeding():
+    return _objects.BreedingIndex(_get("GENDERS").values(), _get("GROUPS").values())
+
+def _rates(f):
+    rates: PDict[_objects.LevelingRate] = PDict()
+    _f: list[bool] = []
+    for r in f[0]:
+        rates[r] = _objects.LevelingRate(r)
+        _f.append(True)
+    for l in rates.values():
+        l.exp[1] = 0
+    for l in range(1, len(f)):
+        for r in range(len(rates)):
+            if _f[r]:
+                _f[r] = False
+                try:
+                    _f[r] = bool(f[l][r])
+                    if _f[r]:
+                        rates.nth(r).exp[l + 1] = int(f[l][r])
+                except IndexError:
+                    pass
+    for l in rates.values():
+        l.update_thresholds()
+    return rates
+
+def _categories(categories):
+    c: PDict[_objects.MoveCategory] = PDict()
+    for r in categories:
+        c[r[0]] = _objects.MoveCategory(*r)
+        c[r[0]].id = len(c) - 1
+    return c
+
+def _move_table(moves):
+    return _objects.MoveTable(moves, _get("TYPES"), _get("CATEGORIES"))
+
+def _moves():
+    m: PDict[_objects.Move] = PDict()
+    for v in _get("MOVE_TABLE").moves:
+        m[v.name] = v
+    return m
+
+_REGISTRIES = {"TYPES": (_types, ("pyk/type/ptypes.pyk",), ()),
+               "_PADDED_TYPE_CHART": (_padded_type_chart, ("pyk/type/table.pyk",), ("TYPES",)),
+               "TYPE_CHART": (_type_chart, (), ("_PADDED_TYPE_CHART",)),
+               "STATS": (_stats, ("pyk/stats.pyk",), ()),
+               "HEALTH": (_health, (), ("STATS",)),
+               "NATURES": (_natures, ("pyk/natures.pyk",), ("STATS",)),
+               "NATURE_MATRIX": (_nature_matrix, (), ("NATURES",)),
+               "GENDERS": (_genders, ("pyk/breeding/gender/genders.pyk", "pyk/breeding/gender/table.pyk"), ()),
+               "GROUPS": (_groups, ("pyk/breeding/group/groups.pyk", "pyk/breeding/group/table.pyk"), ()),
+               "BREEDING": (_breeding, (), ("GENDERS", "GROUPS")),
+               "RATES": (_rates, ("pyk/levels.pyk",), ()),
+               "CATEGORIES": (_categories, ("pyk/categories.pyk",), ()),
+               "MOVE_TABLE": (_move_table, ("pyk/moves.pyk",), ("TYPES", "CATEGORIES")),
+               "MOVES": (_moves, (), ("MOVE_TABLE",))}
+_FIELDS = {"pyk/type/ptypes.pyk": (2, 2),
+           "pyk/stats.pyk": (3, 6),
+           "pyk/breeding/gender/genders.pyk": (3, 4),
+           "pyk/breeding/group/groups.pyk": (2, 3),
+           "pyk/categories.pyk": (2, 2),
+           "pyk/moves.pyk": (7, 10)}
+_ATTACHED = {"TYPES": ("_PADDED_TYPE_CHART",)}
+_LINKS = {"_PADDED_TYPE_CHART": _link_type_chart}
+_BY_KEY = {"MOVE_TABLE"}
+
+def _load(name: str):
+    g = globals()
+    if name not in g:
+        build, files, deps = _REGISTRIES[name]
+        for d in deps:
+            _load(d)
+        with timer(f"load {name}"):
+            g[name] = build(*(load_pyk(f, _FIELDS.get(f)) for f in files))
+        if name in _LINKS:
+            _LINKS[name]()
+        for a in _ATTACHED.get(name, ()):
+            _load(a)
+    return g[name]
+
+def _slots(cls: type) -> list[str]:
+    return [s for c in cls.__mro__ for s in getattr(c, "__slots__", ())]
+
+def _remap(value, pairs: dict[int, tuple]):
+    p = pairs.get(id(value))
+    if p is not None and p[0] is value:
+        return p[1]
+    if type(value) is dict:
+        return {_remap(k, pairs): _remap(v, pairs) for k, v in value.items()}
+    if type(value) is tuple:
+        return tuple(_remap(v, pairs) for v in value)
+    return value
+
+def _install(name: str, value, pairs: dict[int, tuple]):
+    g = globals()
+    old = g[name]
+    if isinstance(old, PDict):
+        objs = [(v, old[k] if k in old else _remap(v, pairs)) for k, v in value.items()]
+        pairs.update((id(v), (v, o)) for v, o in objs)
+        for v, o in objs:
+            for s in _slots(type(v)):
+                if hasattr(v, s):
+                    setattr(o, s, _remap(getattr(v, s), pairs))
+        old.clear()
+        old.update(zip(value, (o for _, o in objs)))
+    elif isinstance(old, np.ndarray) and old.shape == value.shape:
+        old[...] = value
+    elif isinstance(old, _objects.MoveTable):
+        old.adopt(value)
+        pairs.update((id(v), (v, o)) for v, o in zip(value.moves, old.moves))
+    elif isinstance(old, _objects.BreedingIndex):
+        vars(old).update({k: _remap(v, pairs) for k, v in vars(value).items()})
+    else:
+        g[name] = value
+        old = value
+    pairs[id(value)] = value, old
+    if name in _LINKS:
+        _LINKS[name]()
+
+def reload(*files: str) -> list[str]:
+    g = globals()
+    files = set(files)
+    rekeyed = set()
+    try:
+        for n in TopologicalSorter({n: r[2] for n, r in _REGISTRIES.items()}).static_order():
+            build, f, deps = _REGISTRIES[n]
+            if n in g and (files.intersection(f) or any(d in _STAGED and (n not in _BY_KEY or d in rekeyed) for d in deps)):
+                with timer(f"reload {n}"):
+                    _STAGED[n] = build(*(load_pyk(p, _FIELDS.get(p)) for p in f))
+                if not isinstance(g[n], PDict) or tuple(g[n]) != tuple(_STAGED[n]):
+                    rekeyed.add(n)
+        pairs = {}
+        with timer("install"):
+            for n, v in _STAGED.items():
+                _install(n, v, pairs)
+        return list(_STAGED)
+    finally:
+        _STAGED.clear()
+
+def _stamp(filename: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+class Watcher:
+    def __init__(self, files: list[str] | None = None):
+        if files is None:
+            files = [f for r in _REGISTRIES.values() for f in r[1]]
+        self.stamps = {f: _stamp(f) for f in files}
+        self.failed: dict[str, tuple[int, int] | None] | None = None
+
+    def changed(self) -> list[str]:
+        return [f for f, s in self.stamps.items() if _stamp(f) != s]
+
+    def poll(self) -> list[str]:
+        changed = self.changed()
+        if not changed:
+            return []
+        stamps = {f: _stamp(f) for f in changed}
+        try:
+            reloaded = reload(*changed)
+        except (OSError, ValueError, LookupError, TypeError) as e:
+            if stamps != self.failed:
+                self.failed = stamps
+                print(f"Reload of {', '.join(changed)} failed: {e}", file = stderr)
+            return []
+        self.stamps.update(stamps)
+        self.failed = None
+        return reloaded
+
+def load_all(workers: int | None = None):
+    g = globals()
+    pending = [n for n in TopologicalSorter({n: r[2] for n, r in _REGISTRIES.items()}).static_order() if n not in g]
+    files = list(dict.fromkeys(f for n in pending for f in _REGISTRIES[n][1]))
+    with timer("parse all"):
+        parsed = dict(zip(files, load_pyks(files, workers, _FIELDS)))
+    for n in pending:
+        build, f, _ = _REGISTRIES[n]
+        with timer(f"load {n}"):
+            g[n] = build(*map(parsed.get, f))
+        if n in _LINKS:
+            _LINKS[n]()
+
+def effectiveness(attackers, defenders) -> np.ndarray:
+    a = np.asarray(attackers)
+    d = np.asarray(defenders)
+    if d.ndim == 0:
+        raise ValueError("defenders need a trailing axis of types, e.g. [t] or [t1, t2]")
+    chart = _load("_PADDED_TYPE_CHART")
+    e = chart[a, d[..., 0]]
+    for i in range(1, d.shape[-1]):
+        e = e * chart[a, d[..., i]]
+    return e
+
+def calc_stats(base, levels, natures, ivs = 0, evs = 0) -> np.ndarray:
+    base = np.asarray(base, np.int64)
+    k = base.shape[-1]
+    levels = np.asarray(levels, np.int64)[..., None]
+    raw = (2 * base + ivs + np.asarray(evs, np.int64) // 4) * levels // 100
+    mults = _load("NATURE_MATRIX")[np.asarray(natures), :k]
+    final = np.floor((raw + 5) * mults + 1e-9).astype(np.int64)
+    hp = tuple(_load("STATS")).index(_load("HEALTH"))
+    if hp < k:
+        final[..., hp] = raw[..., hp] + levels[..., 0] + 10
+    return final
+
+def __getattr__(name: str):
+    if name in _REGISTRIES:
+        return _load(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(globals().keys() | _REGISTRIES.keys())
\ No newline at end of file
@@ -1,31 +1,52 @@
+from array import array
+from bisect import bisect_right
 from functools import reduce
+import numpy as np
 from operator import mul
+from sys import intern
+from typing import Iterable
 from util import colors, parse_fraction
 
+FLAGS: dict[str, int] = {}
+
+def flag_mask(flags: str) -> int:
+    m = 0
+    for c in flags:
+        m |= FLAGS.setdefault(c, 1 << len(FLAGS))
+    return m
+
 class _NameColor:
+    __slots__ = ("name", "color", "light", "dark")
+
     def __init__(self, name: str, color: str):
-        self.name = name
+        self.name = intern(name)
         self.color, self.light, self.dark = colors(color)
     
     def __str__(self):
         return self.name
 
 class PType(_NameColor):
+    __slots__ = ("id", "chart", "eff")
+
     def __init__(self, name: str, color: str):
         super().__init__(name, color)
+        self.id = -1
+        self.chart: np.ndarray | None = None
         self.eff: dict["PType", float] = {}
 
     def effectiveness(self, *ptypes: "PType"):
-        return reduce(mul, map(self.eff.get, ptypes))
+        return reduce(mul, map(self.eff.__getitem__, ptypes))
 
 class Stat(_NameColor):
+    __slots__ = ("abbr", "short_name", "symbol", "display")
+
     def __init__(self, name: str, abbr: str, color: str, short: str = None, symbol: str = None, star: str = None):
         super().__init__(name, color)
-        self.abbr = abbr
+        self.abbr = intern(abbr)
         if short is None:
-            self.short_name = name
+            self.short_name = self.name
         else:
-            self.short_name = short
+            self.short_name = intern(short)
         self.symbol = symbol
         self.display = not bool(star)
 
@@ -36,8 +57,11 @@ class Stat(_NameColor):
         return f"Stat({self.name}, {self.abbr}, {self.color}, {self.short_name}, {self.symbol}, {self.display})"
 
 class Nature:
+    __slots__ = ("id", "name", "multipliers")
+
     def __init__(self, name: str, *mults: str, keys: tuple[Stat, ...]):
-        self.name = name
+        self.id = -1
+        self.name = intern(name)
         self.multipliers: dict[Stat, float] = {}
         for i in range(len(keys)):
             m = 1
@@ -48,44 +72,121 @@ class Nature:
                 pass
             self.multipliers[keys[i]] = m
 
+def id_mask(objs: Iterable) -> int:
+    m = 0
+    for o in objs:
+        m |= 1 << o.id
+    return m
+
 class Gender(_NameColor):
+    __slots__ = ("id", "priority", "only", "compatibilities", "compatible_mask")
+
     def __init__(self, name: str, color: str, pri: str, only: str = None):
         super().__init__(name, color)
+        self.id = -1
         self.priority = int(pri)
         self.only = bool(only)
         self.compatibilities: dict["Gender", bool] = {}
+        self.compatible_mask = 0
     
     def compatible(self, gender: "Gender"):
-        return self.compatibilities[gender]
+        return bool(self.compatible_mask >> gender.id & 1)
 
 class Group(_NameColor):
+    __slots__ = ("id", "only", "compatibilities", "compatible_mask")
+
     def __init__(self, name: str, color: str, only: str = None):
         super().__init__(name, color)
+        self.id = -1
         self.only = bool(only)
         self.compatibilities: dict["Group", bool] = {}
+        self.compatible_mask = 0
     
     def compatible(self, *groups: "Group"):
-        return any(map(self.compatibilities.get, groups))
+        return bool(self.compatible_mask & id_mask(groups))
+
+class BreedingIndex:
+    def __init__(self, genders: Iterable[Gender], groups: Iterable[Group]):
+        self.genders = tuple(genders)
+        self.groups = tuple(groups)
+        self.priority = np.array([g.priority for g in self.genders], np.int16)
+        self.gender_only = np.array([g.only for g in self.genders], bool)
+        self.rows = tuple(g.compatible_mask for g in self.groups)
+        self.columns = tuple(id_mask(r for r in self.groups if r.compatible_mask >> c.id & 1) for c in self.groups)
+        self.only_groups = id_mask(g for g in self.groups if g.only)
+
+    @staticmethod
+    def _union(masks: tuple[int, ...], mask: int) -> int:
+        u = 0
+        for i, m in enumerate(masks):
+            if mask >> i & 1:
+                u |= m
+        return u
+
+    def can_breed(self, gender_a: Gender, groups_a: Iterable[Group], gender_b: Gender, groups_b: Iterable[Group]) -> bool:
+        ma = id_mask(groups_a)
+        mb = id_mask(groups_b)
+        gender_ok = gender_a.compatible(gender_b)
+        if gender_a.only or gender_b.only:
+            return gender_ok
+        a_hi = bool(self._union(self.rows, ma) & mb)
+        b_hi = bool(self._union(self.columns, ma) & mb)
+        if gender_a.priority > gender_b.priority:
+            group_ok = a_hi
+        elif gender_a.priority < gender_b.priority:
+            group_ok = b_hi
+        else:
+            group_ok = a_hi or b_hi
+        if (ma | mb) & self.only_groups:
+            return group_ok
+        return gender_ok and group_ok
+
+    def partners(self, gender: Gender, groups: Iterable[Group], genders, group_masks) -> np.ndarray:
+        ma = id_mask(groups)
+        g = np.asarray(genders)
+        m = np.asarray(group_masks, np.uint64)
+        gender_ok = np.uint64(gender.compatible_mask) >> g.astype(np.uint64) & np.uint64(1) != 0
+        if gender.only:
+            return gender_ok
+        a_hi = m & np.uint64(self._union(self.rows, ma)) != 0
+        b_hi = m & np.uint64(self._union(self.columns, ma)) != 0
+        p = self.priority[g]
+        group_ok = np.where(p < gender.priority, a_hi, np.where(p > gender.priority, b_hi, a_hi | b_hi))
+        if ma & self.only_groups:
+            group_only = np.ones(len(m), bool)
+        else:
+            group_only = m & np.uint64(self.only_groups) != 0
+        return np.where(self.gender_only[g], gender_ok, np.where(group_only, group_ok, gender_ok & group_ok))
 
 class LevelingRate:
+    __slots__ = ("name", "exp", "thresholds")
+
     def __init__(self, name: str):
-        self.name = name
+        self.name = intern(name)
         self.exp: dict[int, int] = {}
-    
+        self.thresholds = array("q")
+
+    def update_thresholds(self):
+        self.thresholds = array("q", (e for _, e in sorted(self.exp.items())))
+
     def level_at(self, exp: int):
-        level = 1
-        for l, e in self.exp.items():
-            if e > exp:
-                break
-            level = l
-        return level
-    
+        return bisect_right(self.thresholds, exp) or 1
+
+    def levels_at(self, exps) -> np.ndarray:
+        return np.maximum(np.searchsorted(np.frombuffer(self.thresholds, np.int64), exps, "right"), 1)
+
     def exp_to_next(self, curr_exp: int):
-        try:
-            return self.exp[self.level_at(curr_exp) + 1] - curr_exp
-        except IndexError:
-            return 0
-    
+        level = self.level_at(curr_exp)
+        if level < len(self.thresholds):
+            return self.thresholds[level] - curr_exp
+        return 0
+
+    def exp_to_next_many(self, exps) -> np.ndarray:
+        t = np.frombuffer(self.thresholds, np.int64)
+        exps = np.asarray(exps)
+        levels = self.levels_at(exps)
+        return np.where(levels < len(t), t[np.minimum(levels, len(t) - 1)] - exps, 0)
+
     def __str__(self):
         return self.name
     
@@ -93,28 +194,142 @@ class LevelingRate:
         return self.exp[item]
 
 class MoveCategory(_NameColor):
+    __slots__ = ("id",)
+
     def __init__(self, name: str, color: str):
         super().__init__(name, color)
+        self.id = -1
 
 class Move:
-    def __init__(self, name: str, ptype: str, category: str, pp: str, power: str, acc: str, target: str, wide: str = None, flags: str = None, additional: str = None):
-        from objects import CATEGORIES, TYPES
-        self.name = name
-        self.type = TYPES[ptype]
-        self.category = CATEGORIES[category]
-        self.pp = int(pp)
-        self.power = int(power)
-        self.accuracy = int(acc) / 100
-        self.target = tuple(bool(int(target) >> i & 1) for i in range(5, -1, -1))
-        self.wide = bool(wide)
-        self.flags = list(flags or "")
-        self.additional = additional or ""
-    
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: "MoveTable", index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.table.name[self.index]
+
+    @property
+    def type(self) -> PType:
+        return self.table.types.nth(self.table.ptype.item(self.index))
+
+    @property
+    def category(self) -> MoveCategory:
+        return self.table.categories.nth(self.table.category.item(self.index))
+
+    @property
+    def pp(self) -> int:
+        return self.table.pp.item(self.index)
+
+    @property
+    def power(self) -> int:
+        return self.table.power.item(self.index)
+
+    @property
+    def accuracy(self) -> float:
+        return self.table.acc.item(self.index) / 100
+
+    @property
+    def target_mask(self) -> int:
+        return self.table.target.item(self.index)
+
+    @property
+    def wide(self) -> bool:
+        return self.table.wide.item(self.index)
+
+    @property
+    def flag_mask(self) -> int:
+        return self.table.flags.item(self.index)
+
+    @property
+    def additional(self) -> str:
+        return self.table.additional[self.index]
+
+    @property
+    def target(self):
+        return tuple(bool(self.target_mask >> i & 1) for i in range(5, -1, -1))
+
+    @property
+    def flags(self):
+        return [c for c, b in FLAGS.items() if self.flag_mask & b]
+
     def do_additional(self, *args):
         ...
-    
+
     def __str__(self):
         return self.name
-    
+
     def __getitem__(self, item: str):
-        return item in self.flags
\ No newline at end of file
+        return bool(self.flag_mask & FLAGS.get(item, 0))
+
+class MoveTable:
+    COLUMNS = (("name", object), ("ptype", np.int16), ("category", np.int16), ("pp", np.int16), ("power", np.int16),
+               ("acc", np.int16), ("target", np.uint8), ("wide", bool), ("flags", np.uint64), ("additional", object))
+
+    def __init__(self, rows: Iterable[tuple[str | None, ...]], types: dict[str, PType] | None = None, categories: dict[str, MoveCategory] | None = None):
+        if types is None or categories is None:
+            from objects import CATEGORIES, TYPES
+            types, categories = TYPES, CATEGORIES
+        self.types = types
+        self.categories = categories
+        for k, c in self._columns(rows).items():
+            setattr(self, k, c)
+        self.moves = tuple(Move(self, i) for i in range(len(self.name)))
+
+    def _columns(self, rows: Iterable[tuple[str | None, ...]]) -> dict[str, np.ndarray]:
+        columns = [], [], [], [], [], [], [], [], [], []
+        def add(name: str, ptype: str, category: str, pp: str, power: str, acc: str, target: str, wide: str = None, flags: str = None, additional: str = None):
+            for c, v in zip(columns, (intern(name), self.types[ptype].id, self.categories[category].id, int(pp), int(power), int(acc), int(target), bool(wide), flag_mask(flags or ""), additional or "")):
+                c.append(v)
+        for r in rows:
+            add(*r)
+        return {k: np.array(c, t) for (k, t), c in zip(self.COLUMNS, columns)}
+
+    def adopt(self, table: "MoveTable"):
+        columns = {k: getattr(table, k) for k, _ in self.COLUMNS}
+        if np.array_equal(columns["name"], self.name):
+            for k, c in columns.items():
+                old = getattr(self, k)
+                changed = old != c
+                old[changed] = c[changed]
+            return
+        views = {v.name: v for v in self.moves}
+        for k, c in columns.items():
+            setattr(self, k, c)
+        moves = []
+        for i, n in enumerate(self.name):
+            v = views.get(n) or Move(self, i)
+            v.index = i
+            moves.append(v)
+        self.moves = tuple(moves)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def select(self, flags: str = "", target: int = 0, ptype: PType = None, category: MoveCategory = None, min_power: int = None, max_power: int = None, min_accuracy: float = None, wide: bool = None) -> np.ndarray:
+        s = np.ones(len(self.moves), bool)
+        if flags:
+            if any(c not in FLAGS for c in flags):
+                return np.zeros(len(self.moves), bool)
+            f = np.uint64(flag_mask(flags))
+            s &= self.flags & f == f
+        if target:
+            s &= self.target & target == target
+        if ptype is not None:
+            s &= self.ptype == ptype.id
+        if category is not None:
+            s &= self.category == category.id
+        if min_power is not None:
+            s &= self.power >= min_power
+        if max_power is not None:
+            s &= self.power <= max_power
+        if min_accuracy is not None:
+            s &= self.acc >= min_accuracy * 100
+        if wide is not None:
+            s &= self.wide == wide
+        return s
+
+    def query(self, **criteria) -> list[Move]:
+        return [self.moves[i] for i in np.flatnonzero(self.select(**criteria))]
\ No newline at end of file
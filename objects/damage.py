@@ -0,0 +1,51 @@
+import numpy as np
+import objects
+from objects._objects import Move, PType
+
+CATEGORY_STATS = {"Physical": ("ATK", "DEF"), "Special": ("SPA", "SPD")}
+RANDOM_MEAN = 0.925
+STAB = 1.5
+
+def _stat_columns() -> tuple[np.ndarray, np.ndarray]:
+    stats = tuple(objects.STATS)
+    categories = objects.CATEGORIES
+    attack = np.full(len(categories), -1)
+    defense = np.full(len(categories), -1)
+    for name, (a, d) in CATEGORY_STATS.items():
+        if name in categories:
+            attack[categories[name].id] = stats.index(a)
+            defense[categories[name].id] = stats.index(d)
+    return attack, defense
+
+def calculate(attackers, defenders, moves, defender_types, levels = 50, attacker_types = None, crit_rate: float = 0, crit_mult: float = 1.5) -> tuple[np.ndarray, np.ndarray]:
+    table = objects.MOVE_TABLE
+    m = np.asarray(moves)
+    attackers = np.asarray(attackers, float)
+    defenders = np.asarray(defenders, float)
+    ptype = table.ptype[m]
+    attack, defense = _stat_columns()
+    a = attack[table.category[m]]
+    d = defense[table.category[m]]
+    damaging = (a >= 0) & (table.power[m] > 0)
+    a = np.take_along_axis(attackers, np.maximum(a, 0)[..., None], -1)[..., 0]
+    d = np.take_along_axis(defenders, np.maximum(d, 0)[..., None], -1)[..., 0]
+    base = (2 * np.asarray(levels) / 5 + 2) * table.power[m] * a / d / 50 + 2
+    base *= objects.effectiveness(ptype, defender_types) * RANDOM_MEAN * (1 + crit_rate * (crit_mult - 1))
+    if attacker_types is not None:
+        base *= np.where((np.asarray(attacker_types) == ptype[..., None]).any(-1), STAB, 1)
+    hit = np.clip(table.acc[m] / 100, 0, 1)
+    return np.where(damaging, base, 0) * hit, hit
+
+def damage(attacker: list[int], defender: list[int], move: Move, defender_types: tuple[PType, ...], level: int = 50, attacker_types: tuple[PType, ...] = (), crit_rate: float = 0, crit_mult: float = 1.5) -> tuple[float, float]:
+    hit = min(max(move.accuracy, 0), 1)
+    columns = CATEGORY_STATS.get(move.category.name)
+    if columns is None or move.power <= 0:
+        return 0.0, hit
+    stats = tuple(objects.STATS)
+    a = attacker[stats.index(columns[0])]
+    d = defender[stats.index(columns[1])]
+    base = (2 * level / 5 + 2) * move.power * a / d / 50 + 2
+    base *= move.type.effectiveness(*defender_types) * RANDOM_MEAN * (1 + crit_rate * (crit_mult - 1))
+    if move.type in attacker_types:
+        base *= STAB
+    return base * hit, hit
\ No newline at end of file
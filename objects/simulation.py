@@ -0,0 +1,112 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import objects
+from objects import damage
+from typing import Iterator
+
+SPEED = "SPE"
+MAX_TURNS = 100
+MOVE_SLOTS = 4
+CRIT_RATE = 1 / 24
+CRIT_MULT = 1.5
+
+class Summary:
+    def __init__(self, moves: int, types: int):
+        self.battles = 0
+        self.turns = 0
+        self.outcomes = np.zeros(3, np.int64)
+        self.move_uses = np.zeros(moves, np.int64)
+        self.type_battles = np.zeros(types, np.int64)
+        self.type_wins = np.zeros(types, np.int64)
+
+    def merge(self, other: "Summary") -> "Summary":
+        self.battles += other.battles
+        self.turns += other.turns
+        self.outcomes += other.outcomes
+        self.move_uses += other.move_uses
+        self.type_battles += other.type_battles
+        self.type_wins += other.type_wins
+        return self
+
+    def win_rates(self) -> np.ndarray:
+        return self.type_wins / np.maximum(self.type_battles, 1)
+
+def _type_counts(types: np.ndarray, length: int) -> np.ndarray:
+    t = types[types >= 0]
+    return np.bincount(t, minlength = length)
+
+def battle_shard(seed: int, shard: int, battles: int) -> Summary:
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key = (shard,)))
+    table = objects.MOVE_TABLE
+    ntypes = len(objects.TYPES)
+    stats = tuple(objects.STATS)
+    n = (battles, 2)
+    types = rng.integers(0, ntypes, n + (2,))
+    types[..., 1] = np.where((rng.random(n) < 0.5) | (types[..., 1] == types[..., 0]), -1, types[..., 1])
+    rates = tuple(objects.RATES.values())
+    rate_ids = rng.integers(0, len(rates), n)
+    exps = rng.random(n)
+    levels = np.ones(n, np.int64)
+    for i, r in enumerate(rates):
+        s = rate_ids == i
+        levels[s] = r.levels_at((exps[s] * r.thresholds[-1]).astype(np.int64))
+    base = rng.integers(30, 151, n + (6,))
+    natures = rng.integers(0, len(objects.NATURES), n)
+    final = objects.calc_stats(base, levels, natures)
+    pool = np.flatnonzero(table.select(min_power = 1))
+    if not len(pool):
+        pool = np.arange(len(table))
+    moves = rng.choice(pool, n + (MOVE_SLOTS,))
+    shape = n + (MOVE_SLOTS, final.shape[-1])
+    expected, hit = damage.calculate(np.broadcast_to(final[:, :, None], shape), np.broadcast_to(final[:, ::-1, None], shape), moves,
+                                     types[:, ::-1, None], levels[..., None], types[:, :, None])
+    choice = expected.argmax(-1)[..., None]
+    move = np.take_along_axis(moves, choice, -1)[..., 0]
+    p_hit = np.take_along_axis(hit, choice, -1)[..., 0]
+    on_hit = np.take_along_axis(expected, choice, -1)[..., 0] / np.maximum(p_hit, 1e-9) / damage.RANDOM_MEAN
+    hp = final[..., stats.index(objects.HEALTH)].astype(float)
+    speed = final[..., stats.index(SPEED)]
+    summary = Summary(len(table), ntypes)
+    active = np.ones(battles, bool)
+    winner = np.full(battles, 2)
+    turns = np.zeros(battles, np.int64)
+    for _ in range(MAX_TURNS):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+        tie = rng.integers(0, 2, len(idx))
+        first = np.where(speed[idx, 0] == speed[idx, 1], tie, speed[idx, 1] > speed[idx, 0])
+        turns[idx] += 1
+        for side in (first, 1 - first):
+            still = active[idx]
+            hits = rng.random(len(idx)) < p_hit[idx, side]
+            rolls = rng.uniform(0.85, 1, len(idx)) * np.where(rng.random(len(idx)) < CRIT_RATE, CRIT_MULT, 1)
+            dealt = np.where(still & hits & (on_hit[idx, side] > 0), np.maximum(np.floor(on_hit[idx, side] * rolls), 1), 0)
+            hp[idx, 1 - side] -= dealt
+            summary.move_uses += np.bincount(move[idx, side][still], minlength = len(table))
+            ko = still & (hp[idx, 1 - side] <= 0)
+            winner[idx[ko]] = side[ko]
+            active[idx[ko]] = False
+    summary.battles = battles
+    summary.turns = int(turns.sum())
+    summary.outcomes = np.bincount(winner, minlength = 3)
+    summary.type_battles = _type_counts(types, ntypes)
+    won = winner < 2
+    summary.type_wins = _type_counts(types[won, winner[won]], ntypes)
+    return summary
+
+def run(battles: int, seed: int = 0, workers: int | None = None, shard_size: int = 10000) -> Iterator[Summary]:
+    shards = range((battles + shard_size - 1) // shard_size)
+    sizes = [min(shard_size, battles - s * shard_size) for s in shards]
+    if workers == 1:
+        yield from map(battle_shard, [seed] * len(sizes), shards, sizes)
+        return
+    objects.load_all(1)
+    with ProcessPoolExecutor(workers) as pool:
+        yield from pool.map(battle_shard, [seed] * len(sizes), shards, sizes)
+
+def simulate(battles: int, seed: int = 0, workers: int | None = None, shard_size: int = 10000) -> Summary:
+    summary = Summary(len(objects.MOVE_TABLE), len(objects.TYPES))
+    for s in run(battles, seed, workers, shard_size):
+        summary.merge(s)
+    return summary
@@ -1,4 +1,6 @@
+import ctypes
 from enum import Enum
+from instrument import count, timer
 import numpy as np
 from OpenGL.GL import *
 import pygame
@@ -32,12 +34,17 @@ class Base:
     def run(self):
         self.initialize()
         while self.running:
-            self.input.update()
-            if self.input.quit:
-                self.running = False
-                break
-            self.update()
-            pygame.display.flip()
+            with timer("frame"):
+                with timer("frame input"):
+                    self.input.update()
+                if self.input.quit:
+                    self.running = False
+                    break
+                with timer("frame update"):
+                    self.update()
+                with timer("frame flip"):
+                    pygame.display.flip()
+            count("frames")
             self.delta = self.clock.tick(self.max_fps) / 1000
         pygame.quit()
         exit(0)
@@ -79,16 +86,17 @@ class Attribute:
         VEC3  = 4
         VEC4  = 5
 
-    def __init__(self, data_type: Type, data: list | tuple | float):
+    COMPONENTS = {Type.INT: 1, Type.FLOAT: 1, Type.VEC2: 2, Type.VEC3: 3, Type.VEC4: 4}
+
+    def __init__(self, data_type: Type, data: list | tuple | float | np.ndarray | memoryview):
         self.data_type = data_type
         self.data = data
         self.buffer = glGenBuffers(1)
         self.upload_data()
 
     def upload_data(self):
-        data = np.array(self.data).astype(np.float32)
         glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
-        glBufferData(GL_ARRAY_BUFFER, data.ravel(), GL_STATIC_DRAW)
+        glBufferData(GL_ARRAY_BUFFER, as_float32(self.data), GL_STATIC_DRAW)
 
     def assoc_var(self, prog_ref, var_name: str):
         var_ref = glGetAttribLocation(prog_ref, var_name)
@@ -110,6 +118,78 @@ class Attribute:
             raise ValueError(f"Variable type {self.data_type} not recognized.")
         glEnableVertexAttribArray(var_ref)
 
+def as_float32(data: list | tuple | float | np.ndarray | memoryview) -> np.ndarray:
+    return np.ascontiguousarray(np.asarray(data, np.float32))
+
+class VertexLayout:
+    def __init__(self, types: dict[str, Attribute.Type]):
+        self.types = types
+        self.offsets: dict[str, int] = {}
+        self.components = 0
+        for name, t in types.items():
+            self.offsets[name] = self.components
+            self.components += Attribute.COMPONENTS[t]
+        self.stride = self.components * 4
+
+    def columns(self, name: str) -> slice:
+        o = self.offsets[name]
+        return slice(o, o + Attribute.COMPONENTS[self.types[name]])
+
+    def pack(self, data: dict[str, list | tuple | np.ndarray | memoryview]) -> np.ndarray:
+        if data.keys() != self.types.keys():
+            raise KeyError(f"Expected attributes {list(self.types)}, got {list(data)}")
+        arrays = {n: as_float32(d).reshape(-1, Attribute.COMPONENTS[self.types[n]]) for n, d in data.items()}
+        counts = {len(a) for a in arrays.values()}
+        if len(counts) > 1:
+            raise ValueError(f"Attributes have different vertex counts: { {n: len(a) for n, a in arrays.items()} }")
+        packed = np.empty((counts.pop() if counts else 0, self.components), np.float32)
+        for n, a in arrays.items():
+            packed[:, self.columns(n)] = a
+        return packed
+
+    def check(self, data: np.ndarray | memoryview) -> np.ndarray:
+        a = np.asarray(data)
+        if a.dtype != np.float32 or not a.flags.c_contiguous:
+            raise TypeError("Interleaved vertex data must be C-contiguous float32")
+        if a.size % self.components:
+            raise ValueError(f"Vertex data of size {a.size} does not divide into rows of {self.components}")
+        return a.reshape(-1, self.components)
+
+class VertexBuffer:
+    def __init__(self, layout: VertexLayout, data: dict[str, list | tuple | np.ndarray | memoryview] | np.ndarray | memoryview, usage = GL_STATIC_DRAW):
+        self.layout = layout
+        self.data = layout.pack(data) if isinstance(data, dict) else layout.check(data)
+        self.usage = usage
+        self.buffer = glGenBuffers(1)
+        self.upload_data()
+
+    def __len__(self):
+        return len(self.data)
+
+    def attribute(self, name: str) -> np.ndarray:
+        return self.data[:, self.layout.columns(name)]
+
+    def upload_data(self):
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.data, self.usage)
+
+    def update(self, first: int = 0, stop: int | None = None, **attributes: list | tuple | np.ndarray):
+        stop = len(self.data) if stop is None else stop
+        for name, d in attributes.items():
+            self.attribute(name)[first:stop] = as_float32(d).reshape(stop - first, -1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        glBufferSubData(GL_ARRAY_BUFFER, first * self.layout.stride, (stop - first) * self.layout.stride, self.data[first:stop])
+
+    def assoc_var(self, prog_ref, var_name: str):
+        var_ref = glGetAttribLocation(prog_ref, var_name)
+        if var_ref == -1:
+            print(f"Variable {var_name} not found.", file = stderr)
+            return
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        size = Attribute.COMPONENTS[self.layout.types[var_name]]
+        glVertexAttribPointer(var_ref, size, GL_FLOAT, False, self.layout.stride, ctypes.c_void_p(self.layout.offsets[var_name] * 4))
+        glEnableVertexAttribArray(var_ref)
+
 class Uniform:
     class Type(Enum):
         INT       = 1
@@ -155,6 +235,56 @@ class Uniform:
         else:
             raise ValueError(f"Variable type {self.data_type} not recognized.")
 
+class UniformBlock:
+    LAYOUT = {Uniform.Type.INT: (4, 1), Uniform.Type.FLOAT: (4, 1), Uniform.Type.VEC2: (8, 2),
+              Uniform.Type.VEC3: (16, 3), Uniform.Type.VEC4: (16, 4), Uniform.Type.MAT4: (16, 16)}
+
+    def __init__(self, name: str, fields: dict[str, Uniform.Type], binding: int = 0):
+        self.name = name
+        self.fields = fields
+        self.binding = binding
+        self.offsets: dict[str, int] = {}
+        size = 0
+        for n, t in fields.items():
+            if t not in UniformBlock.LAYOUT:
+                raise ValueError(f"Variable type {t} not supported in uniform blocks.")
+            align, floats = UniformBlock.LAYOUT[t]
+            size = -(-size // align) * align
+            self.offsets[n] = size
+            size += floats * 4
+        self.size = -(-size // 16) * 16
+        self.data = np.zeros(self.size // 4, np.float32)
+        self.buffer = None
+
+    def set(self, name: str, value):
+        t = self.fields[name]
+        o = self.offsets[name] // 4
+        if t is Uniform.Type.INT:
+            self.data.view(np.int32)[o] = value
+        elif t is Uniform.Type.MAT4:
+            self.data[o:o + 16] = np.asarray(value, np.float32).T.ravel()
+        else:
+            self.data[o:o + UniformBlock.LAYOUT[t][1]] = value
+
+    def upload(self, state = None):
+        if self.buffer is None:
+            self.buffer = glGenBuffers(1)
+            glBindBuffer(GL_UNIFORM_BUFFER, self.buffer)
+            glBufferData(GL_UNIFORM_BUFFER, self.data, GL_DYNAMIC_DRAW)
+            glBindBufferBase(GL_UNIFORM_BUFFER, self.binding, self.buffer)
+            calls = 4
+        else:
+            glBindBuffer(GL_UNIFORM_BUFFER, self.buffer)
+            glBufferSubData(GL_UNIFORM_BUFFER, 0, self.data.nbytes, self.data)
+            calls = 2
+        if state is not None:
+            state.calls += calls
+
+    def bind(self, prog_ref):
+        index = glGetUniformBlockIndex(prog_ref, self.name)
+        if index != GL_INVALID_INDEX:
+            glUniformBlockBinding(prog_ref, index, self.binding)
+
 class Texture:
     def __init__(self, filename: str = None, properties: dict[str, Constant] = None):
         self.w, self.h = 0, 0
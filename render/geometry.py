@@ -1,23 +1,60 @@
 from math import cos, sin, pi
-from numpy import linspace
-from render import Attribute
+import numpy as np
+from OpenGL import GL
+from render import Attribute, VertexBuffer, VertexLayout
 from typing import Callable
 
+def weld(*attributes: list | tuple | np.ndarray) -> tuple[np.ndarray, tuple[np.ndarray, ...]]:
+    data = [np.asarray(a, np.float32).reshape(len(a), -1) for a in attributes]
+    rows = np.ascontiguousarray(np.concatenate(data, axis = 1)) + np.float32(0)
+    keys = rows.view(np.dtype((np.void, rows.itemsize * rows.shape[1]))).ravel()
+    _, first, inverse = np.unique(keys, return_index = True, return_inverse = True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[inverse.ravel()], tuple(d[first[order]] for d in data)
+
 class Geometry:
     def __init__(self):
         self.attributes: dict[str, Attribute] = {}
+        self.vertex_buffer: VertexBuffer | None = None
         self.vertex_count = 0
+        self.indices: np.ndarray | None = None
+        self.index_buffer = None
+        self.index_type = None
 
     def count_vertices(self):
+        if self.vertex_buffer is not None:
+            self.vertex_count = len(self.vertex_buffer)
+            return
         for v in self.attributes.values():
-            if isinstance(v.data, (list, tuple)):
+            if isinstance(v.data, (list, tuple, np.ndarray)):
                 self.vertex_count = len(v.data)
                 return
         raise RuntimeError("No sized attribute found")
 
-    def add_attribute(self, data_type: Attribute.Type, var_name: str, data: list|tuple|int|float):
+    def add_attribute(self, data_type: Attribute.Type, var_name: str, data: list|tuple|np.ndarray|int|float):
         self.attributes[var_name] = Attribute(data_type, data)
 
+    def set_vertices(self, attributes: dict[str, tuple[Attribute.Type, list | tuple | np.ndarray]], usage = GL.GL_STATIC_DRAW):
+        layout = VertexLayout({n: t for n, (t, _) in attributes.items()})
+        self.vertex_buffer = VertexBuffer(layout, {n: d for n, (_, d) in attributes.items()}, usage)
+
+    def set_indices(self, indices: list | tuple | np.ndarray):
+        indices = np.asarray(indices)
+        if len(indices) and indices.max() >= 1 << 16:
+            self.indices = indices.astype(np.uint32)
+            self.index_type = GL.GL_UNSIGNED_INT
+        else:
+            self.indices = indices.astype(np.uint16)
+            self.index_type = GL.GL_UNSIGNED_SHORT
+        if self.index_buffer is None:
+            self.index_buffer = GL.glGenBuffers(1)
+        previous = GL.glGetIntegerv(GL.GL_ARRAY_BUFFER_BINDING)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.index_buffer)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, self.indices, GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, previous)
+
 class Rectangle(Geometry):
     def __init__(self, width = 1, height = 1):
         super().__init__()
@@ -36,9 +73,11 @@ class Rectangle(Geometry):
         pos = [p0, p1, p3, p0, p3, p2]
         col = [c0, c1, c3, c0, c3, c2]
         tex = [t0, t1, t3, t0, t3, t2]
-        self.add_attribute(Attribute.Type.VEC3, "vertexPosition", pos)
-        self.add_attribute(Attribute.Type.VEC3, "vertexColor", col)
-        self.add_attribute(Attribute.Type.VEC2, "vertexUV", tex)
+        indices, (pos, col, tex) = weld(pos, col, tex)
+        self.set_vertices({"vertexPosition": (Attribute.Type.VEC3, pos),
+                           "vertexColor": (Attribute.Type.VEC3, col),
+                           "vertexUV": (Attribute.Type.VEC2, tex)})
+        self.set_indices(indices)
         self.count_vertices()
 
 class Polygon(Geometry):
@@ -48,9 +87,11 @@ class Polygon(Geometry):
         pos = [p for s in range(sides) for p in [(0, 0, 0), (rad*cos(s*a), rad*sin(s*a), 0), (rad*cos((s+1)*a), rad*sin((s+1)*a), 0)]]
         col = [(1, 1, 1), (0.75, 0.75, 0.75), (0.75, 0.75, 0.75)] * sides
         tex = [p for s in range(sides) for p in [(0.5, 0.5), (cos(s * a) * 0.5 + 0.5, sin(s * a) * 0.5 + 0.5), (cos((s + 1) * a) * 0.5 + 0.5, sin((s + 1) * a) * 0.5 + 0.5)]]
-        self.add_attribute(Attribute.Type.VEC3, "vertexPosition", pos)
-        self.add_attribute(Attribute.Type.VEC3, "vertexColor", col)
-        self.add_attribute(Attribute.Type.VEC2, "vertexUV", tex)
+        indices, (pos, col, tex) = weld(pos, col, tex)
+        self.set_vertices({"vertexPosition": (Attribute.Type.VEC3, pos),
+                           "vertexColor": (Attribute.Type.VEC3, col),
+                           "vertexUV": (Attribute.Type.VEC2, tex)})
+        self.set_indices(indices)
         self.count_vertices()
 
 class Box(Geometry):
@@ -89,40 +130,42 @@ class Box(Geometry):
                c4, c5, c7, c4, c7, c6,
                c1, c0, c2, c1, c2, c3]
         tex = [t0, t1, t3, t0, t3, t2] * 6
-        self.add_attribute(Attribute.Type.VEC3, "vertexPosition", pos)
-        self.add_attribute(Attribute.Type.VEC3, "vertexColor", col)
-        self.add_attribute(Attribute.Type.VEC2, "vertexUV", tex)
+        indices, (pos, col, tex) = weld(pos, col, tex)
+        self.set_vertices({"vertexPosition": (Attribute.Type.VEC3, pos),
+                           "vertexColor": (Attribute.Type.VEC3, col),
+                           "vertexUV": (Attribute.Type.VEC2, tex)})
+        self.set_indices(indices)
         self.count_vertices()
 
+def _evaluate(func: Callable, u: np.ndarray, v: np.ndarray, vectorized: bool = True) -> np.ndarray:
+    p = func(u, v) if vectorized else np.frompyfunc(func, 2, 3)(u, v)
+    return np.stack(np.broadcast_arrays(*p), axis = -1).astype(np.float32)
+
 class Parametric(Geometry):
-    def __init__(self, us: float, ue: float, ur: int, vs: float, ve: float, vr: int, func: Callable[[float, float], tuple[float, float, float]]):
+    COLORS = np.array([(1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 1, 1), (1, 0, 1), (1, 1, 0)], np.float32)
+
+    def __init__(self, us: float, ue: float, ur: int, vs: float, ve: float, vr: int, func: Callable[[np.ndarray, np.ndarray], tuple[np.ndarray | float, np.ndarray | float, np.ndarray | float]], vectorized: bool = True):
         super().__init__()
-        grid = [[(u, v) for v in linspace(0, 1, vr + 1)] for u in linspace(0, 1, ur + 1)]
-        tex = []
-        for x in range(ur):
-            for y in range(vr):
-                a = grid[x][y]
-                b = grid[x+1][y]
-                c = grid[x+1][y+1]
-                d = grid[x][y+1]
-                tex.extend([a, b, c, a, c, d])
-        pos = list(map(lambda p: func(*p), map(lambda p: (p[0] * (ue - us) + us, p[1] * (ve - vs) + vs), tex)))
-        col = [(1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 1, 1), (1, 0, 1), (1, 1, 0)] * ur * vr
-        self.add_attribute(Attribute.Type.VEC3, "vertexPosition", pos)
-        self.add_attribute(Attribute.Type.VEC3, "vertexColor", col)
-        self.add_attribute(Attribute.Type.VEC2, "vertexUV", tex)
+        s, t = np.meshgrid(np.linspace(0, 1, ur + 1), np.linspace(0, 1, vr + 1), indexing = "ij")
+        points = _evaluate(func, s * (ue - us) + us, t * (ve - vs) + vs, vectorized).reshape(-1, 3)
+        a = (np.arange(ur)[:, None] * (vr + 1) + np.arange(vr)).ravel()
+        b = a + vr + 1
+        self.set_vertices({"vertexPosition": (Attribute.Type.VEC3, points),
+                           "vertexColor": (Attribute.Type.VEC3, np.resize(Parametric.COLORS, points.shape)),
+                           "vertexUV": (Attribute.Type.VEC2, np.stack((s, t), axis = -1).reshape(-1, 2))})
+        self.set_indices(np.stack((a, b, b + 1, a, b + 1, a + 1), axis = -1).ravel())
         self.count_vertices()
 
 class Plane(Parametric):
     def __init__(self, width: float = 1, height: float = 1, w_sub: int = 50, h_sub: int = 50):
-        def func(u: float, v: float):
+        def func(u: np.ndarray, v: np.ndarray):
             return u, v, 0
         super().__init__(-width / 2, width / 2, w_sub, -height / 2, height / 2, h_sub, func)
 
 class Ellipsoid(Parametric):
     def __init__(self, x_rad: float = 1, y_rad: float = 1, z_rad: float = 1, ur = 50, vr = 50):
-        def func(u: float, v: float):
-            return x_rad * sin(u) * cos(v), y_rad * sin(v), z_rad * cos(u) * cos(v)
+        def func(u: np.ndarray, v: np.ndarray):
+            return x_rad * np.sin(u) * np.cos(v), y_rad * np.sin(v), z_rad * np.cos(u) * np.cos(v)
         super().__init__(0, 2*pi, ur, 0, 2*pi, vr, func)
 
 class Sphere(Ellipsoid):
@@ -131,8 +174,8 @@ class Sphere(Ellipsoid):
 
 class Cylindrical(Parametric):
     def __init__(self, x_rad_top: float = 1, x_rad_bottom: float = 1, z_rad_top: float = 1, z_rad_bottom: float = 1, height: float = 1, res = 50):
-        def func(u: float, v: float):
-            return (v * x_rad_top + (1-v) * x_rad_bottom) * sin(u), height * (v - 0.5), (v * z_rad_top + (1-v) * z_rad_bottom) * cos(u)
+        def func(u: np.ndarray, v: np.ndarray):
+            return (v * x_rad_top + (1-v) * x_rad_bottom) * np.sin(u), height * (v - 0.5), (v * z_rad_top + (1-v) * z_rad_bottom) * np.cos(u)
         super().__init__(0, 2*pi, res, 0, 1, 1, func)
 
 class Cylinder(Cylindrical):
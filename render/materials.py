@@ -1,21 +1,28 @@
 from OpenGL import GL
-from render import Texture, Uniform
+from render import Texture, Uniform, UniformBlock
 from render.openGL_util import *
 from typing import Any
 
+CAMERA = UniformBlock("Camera", {"projectionMatrix": Uniform.Type.MAT4, "viewMatrix": Uniform.Type.MAT4})
+CAMERA_GLSL = """
+    layout(std140) uniform Camera {
+        mat4 projectionMatrix;
+        mat4 viewMatrix;
+    };
+"""
+
 class Material:
     def __init__(self, vs_code: str, fs_code: str):
         self.program = initialize_program(vs_code, fs_code)
-        self.uniforms = {"modelMatrix": Uniform(Uniform.Type.MAT4, None),
-                         "viewMatrix": Uniform(Uniform.Type.MAT4, None),
-                         "projectionMatrix": Uniform(Uniform.Type.MAT4, None)}
-        self.settings = {"drawStyle": None}
+        CAMERA.bind(self.program)
+        self.uniforms = {"modelMatrix": Uniform(Uniform.Type.MAT4, None)}
+        self.settings = {"drawStyle": None, "blended": False}
 
     def locate_uniforms(self):
         for v, u in self.uniforms.items():
             u.locate_variable(self.program, v)
 
-    def render_settings(self):
+    def render_settings(self, state: GLState):
         raise NotImplementedError
 
     def set_properties(self, properties: dict[str, Any] = None):
@@ -33,9 +40,7 @@ class Material:
 
 class BasicMaterial(Material):
     def __init__(self):
-        vs_code = """
-            uniform mat4 projectionMatrix;
-            uniform mat4 viewMatrix;
+        vs_code = CAMERA_GLSL + """
             uniform mat4 modelMatrix;
             in vec3 vertexPosition;
             in vec3 vertexColor;
@@ -62,7 +67,7 @@ class BasicMaterial(Material):
         self.add_uniform(Uniform.Type.BOOL, "useVertexColors", 0)
         self.locate_uniforms()
 
-    def render_settings(self):
+    def render_settings(self, state: GLState):
         raise NotImplementedError
 
 class PointBasicMaterial(BasicMaterial):
@@ -73,12 +78,9 @@ class PointBasicMaterial(BasicMaterial):
         self.settings["roundedPoints"] = True
         self.set_properties(properties)
 
-    def render_settings(self):
-        GL.glPointSize(self.settings["pointSize"])
-        if self.settings["roundedPoints"]:
-            GL.glEnable(GL.GL_POINT_SMOOTH)
-        else:
-            GL.glDisable(GL.GL_POINT_SMOOTH)
+    def render_settings(self, state: GLState):
+        state.set_point_size(self.settings["pointSize"])
+        state.enable(GL.GL_POINT_SMOOTH, self.settings["roundedPoints"])
 
 class LineBasicMaterial(BasicMaterial):
     def __init__(self, properties = None):
@@ -88,8 +90,8 @@ class LineBasicMaterial(BasicMaterial):
         self.settings["lineWidth"] = 2
         self.set_properties(properties)
 
-    def render_settings(self):
-        GL.glLineWidth(self.settings["lineWidth"])
+    def render_settings(self, state: GLState):
+        state.set_line_width(self.settings["lineWidth"])
         if self.settings["lineType"] == "connected":
             self.settings["drawStyle"] = GL.GL_LINE_STRIP
         elif self.settings["lineType"] == "loop":
@@ -107,22 +109,14 @@ class SurfaceBasicMaterial(BasicMaterial):
         self.settings["lineWidth"] = 2
         self.set_properties(properties)
 
-    def render_settings(self):
-        if self.settings["doubleSided"]:
-            GL.glDisable(GL.GL_CULL_FACE)
-        else:
-            GL.glEnable(GL.GL_CULL_FACE)
-        if self.settings["wireframe"]:
-            GL.glPolygonMode(GL.GL_FRONT_AND_BACK, GL.GL_LINE)
-        else:
-            GL.glPolygonMode(GL.GL_FRONT_AND_BACK, GL.GL_FILL)
-        GL.glLineWidth(self.settings["lineWidth"])
+    def render_settings(self, state: GLState):
+        state.enable(GL.GL_CULL_FACE, not self.settings["doubleSided"])
+        state.set_polygon_mode(GL.GL_LINE if self.settings["wireframe"] else GL.GL_FILL)
+        state.set_line_width(self.settings["lineWidth"])
 
 class TextureMaterial(Material):
     def __init__(self, tex: Texture, properties: dict[str, Constant] = None):
-        vs_code = """
-            uniform mat4 projectionMatrix;
-            uniform mat4 viewMatrix;
+        vs_code = CAMERA_GLSL + """
             uniform mat4 modelMatrix;
             in vec3 vertexPosition;
             in vec2 vertexUV;
@@ -146,23 +140,15 @@ class TextureMaterial(Material):
         self.add_uniform(Uniform.Type.SAMPLER2D, "texture", (tex.tex, 1))
         self.locate_uniforms()
         self.settings["drawStyle"] = GL.GL_TRIANGLES
+        self.settings["blended"] = True
         self.settings["doubleSided"] = False
         self.settings["wireframe"] = False
         self.settings["lineWidth"] = 1
         self.settings["insideOut"] = False
         self.set_properties(properties)
 
-    def render_settings(self):
-        if self.settings["doubleSided"]:
-            GL.glDisable(GL.GL_CULL_FACE)
-        else:
-            GL.glEnable(GL.GL_CULL_FACE)
-        if self.settings["wireframe"]:
-            GL.glPolygonMode(GL.GL_FRONT_AND_BACK, GL.GL_LINE)
-        else:
-            GL.glPolygonMode(GL.GL_FRONT_AND_BACK, GL.GL_FILL)
-        GL.glLineWidth(self.settings["lineWidth"])
-        if self.settings["insideOut"]:
-            GL.glFrontFace(GL.GL_CW)
-        else:
-            GL.glFrontFace(GL.GL_CCW)
\ No newline at end of file
+    def render_settings(self, state: GLState):
+        state.enable(GL.GL_CULL_FACE, not self.settings["doubleSided"])
+        state.set_polygon_mode(GL.GL_LINE if self.settings["wireframe"] else GL.GL_FILL)
+        state.set_line_width(self.settings["lineWidth"])
+        state.set_front_face(GL.GL_CW if self.settings["insideOut"] else GL.GL_CCW)
\ No newline at end of file
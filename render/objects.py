@@ -1,34 +1,105 @@
 from enum import Enum
+from instrument import count, timer
 from math import pi
+import numpy as np
 from numpy import ndarray
 from numpy.linalg import inv
 from OpenGL import GL
 from operator import truediv
 from pygame import image, font, surface
-from render import Input, matrices, Texture
+from render import Input, matrices, Texture, Uniform
 from render.geometry import Geometry, Rectangle
-from render.materials import Material, TextureMaterial
+from render.materials import CAMERA, Material, TextureMaterial
+from render.openGL_util import GLState
 
 class Object3d:
     def __init__(self):
-        self.local_transform = matrices.identity()
+        self._local = matrices.identity()
+        self._world = self._local
+        self._dirty = False
+        self._dirty_below = False
+        self._graph: TransformGraph | None = None
+        self._index = -1
         self.parent: "Object3d" | None = None
         self.children: list["Object3d"] = []
 
+    @property
+    def local_transform(self) -> ndarray:
+        if self._graph is None:
+            return self._local
+        return self._graph.local[self._index]
+
+    @local_transform.setter
+    def local_transform(self, matrix: ndarray):
+        if self._graph is None:
+            self._local = matrix
+        else:
+            self._graph.local[self._index] = matrix
+        self.invalidate()
+
+    def invalidate(self):
+        if self._graph is not None:
+            self._graph.touch(self)
+            return
+        if not self._dirty:
+            stack = [self]
+            while stack:
+                n = stack.pop()
+                n._dirty = True
+                stack.extend(c for c in n.children if not c._dirty)
+        p = self.parent
+        while p is not None and not p._dirty_below:
+            p._dirty_below = True
+            p = p.parent
+
     def add(self, child: "Object3d"):
         self.children.append(child)
         child.parent = self
+        if self._graph is None:
+            child.invalidate()
+        else:
+            self._graph.attach(child)
 
     def remove(self, child: "Object3d"):
         self.children.remove(child)
         child.parent = None
+        if child._graph is not None:
+            child._graph.detach(child)
+        child.invalidate()
 
     def global_transform(self):
-        if self.parent is None:
-            return self.local_transform
-        return self.parent.global_transform() @ self.local_transform
+        if self._graph is not None:
+            self._graph.update()
+            return self._graph.world[self._index]
+        if self._dirty:
+            self._world = self._local if self.parent is None else self.parent.global_transform() @ self._local
+            self._dirty = False
+        return self._world
+
+    def update_transforms(self):
+        if self._graph is not None:
+            self._graph.update()
+            return
+        if self._dirty:
+            self.global_transform()
+            self._dirty_below = True
+        stack = [self]
+        while stack:
+            n = stack.pop()
+            if n._dirty_below:
+                n._dirty_below = False
+                w = n._world
+                for c in n.children:
+                    if c._dirty:
+                        c._world = w @ c._local
+                        c._dirty = False
+                        c._dirty_below = True
+                    if c._dirty_below:
+                        stack.append(c)
 
     def descendants(self) -> list["Object3d"]:
+        if self._graph is not None and self._graph.root is self:
+            return self._graph.ordered()
         d = [self]
         for c in self.children:
             d.extend(c.descendants())
@@ -38,7 +109,7 @@ class Object3d:
         if local:
             self.local_transform = self.local_transform @ matrix
         else:
-            self.local_transform =  matrix @ self.local_transform
+            self.local_transform = matrix @ self.local_transform
 
     def translate(self, x: float, y: float, z: float, local = True):
         self.apply_transformation(matrices.translation(x, y, z), local)
@@ -56,16 +127,101 @@ class Object3d:
         self.apply_transformation(matrices.scale(x, y, z), local)
 
     def get_position(self):
-        return tuple(self.local_transform.item((i, 3)) for i in range(3))
+        return tuple(self.local_transform[:3, 3].tolist())
 
     def set_position(self, x: float, y: float, z: float):
-        self.local_transform.itemset((0, 3), x)
-        self.local_transform.itemset((1, 3), y)
-        self.local_transform.itemset((2, 3), z)
+        self.local_transform[:3, 3] = x, y, z
+        self.invalidate()
+
+class TransformGraph:
+    def __init__(self, root: Object3d, capacity: int = 64):
+        self.root = root
+        self.local = np.empty((capacity, 4, 4), np.float32)
+        self.world = np.empty_like(self.local)
+        self.parents = np.zeros(capacity, np.intp)
+        self.depth = np.zeros(capacity, np.intp)
+        self.nodes: list[Object3d] = []
+        self.preorder: list[Object3d] = []
+        self.levels: list[tuple[int, int]] = []
+        self.count = 0
+        self.reorder = True
+        self.dirty_level = 0
+        self.attach(root)
+
+    def attach(self, node: Object3d):
+        for n in node.descendants():
+            if self.count == len(self.local):
+                self.local = np.concatenate((self.local, np.empty_like(self.local)))
+            self.local[self.count] = n._local
+            n._graph = self
+            n._index = self.count
+            self.count += 1
+        self.reorder = True
+
+    def detach(self, node: Object3d):
+        for n in node.descendants():
+            n._local = self.local[n._index].astype(float)
+            n._graph = None
+            n._index = -1
+            n._dirty = True
+            n._dirty_below = False
+        self.reorder = True
+
+    def touch(self, node: Object3d):
+        if not self.reorder:
+            self.dirty_level = min(self.dirty_level, self.depth.item(node._index))
+
+    def _rebuild(self):
+        order = []
+        self.levels = []
+        level = [self.root]
+        while level:
+            self.levels.append((len(order), len(order) + len(level)))
+            order.extend(level)
+            level = [c for n in level for c in n.children]
+        k = len(order)
+        old = np.fromiter((n._index for n in order), np.intp, k)
+        local = np.empty((max(len(self.local), 2 * k), 4, 4), np.float32)
+        local[:k] = self.local[old]
+        self.local = local
+        self.world = np.empty_like(local)
+        for i, n in enumerate(order):
+            n._index = i
+        self.parents = np.fromiter((0 if n.parent is None else n.parent._index for n in order), np.intp, k)
+        self.depth = np.repeat(np.arange(len(self.levels)), [e - s for s, e in self.levels])
+        self.nodes = order
+        self.preorder = []
+        stack = [self.root]
+        while stack:
+            n = stack.pop()
+            self.preorder.append(n)
+            stack.extend(reversed(n.children))
+        self.count = k
+        self.reorder = False
+        self.dirty_level = 0
+
+    def ordered(self) -> list[Object3d]:
+        if self.reorder:
+            self._rebuild()
+        return list(self.preorder)
+
+    def update(self):
+        if self.reorder:
+            self._rebuild()
+        if self.dirty_level >= len(self.levels):
+            return
+        for s, e in self.levels[self.dirty_level:]:
+            if s == 0:
+                self.world[0] = self.local[0]
+            else:
+                np.matmul(self.world[self.parents[s:e]], self.local[s:e], out = self.world[s:e])
+        self.dirty_level = len(self.levels)
 
 class Scene(Object3d):
-    def __init__(self):
+    def __init__(self, flat: bool = False):
         super().__init__()
+        if flat:
+            TransformGraph(self)
 
 class Group(Object3d):
     def __init__(self):
@@ -90,30 +246,86 @@ class Mesh(Object3d):
         GL.glBindVertexArray(self.vao)
         for v, a in geometry.attributes.items():
             a.assoc_var(material.program, v)
+        if geometry.vertex_buffer is not None:
+            for v in geometry.vertex_buffer.layout.types:
+                geometry.vertex_buffer.assoc_var(material.program, v)
+        if geometry.index_buffer is not None:
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, geometry.index_buffer)
         GL.glBindVertexArray(0)
 
 class Renderer:
+    FRAME_UNIFORMS = ("viewMatrix", "projectionMatrix")
+
     def __init__(self, clear_color = (0, 0, 0)):
         GL.glEnable(GL.GL_DEPTH_TEST)
         GL.glClearColor(*clear_color, 1)
         GL.glEnable(GL.GL_BLEND)
         GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+        self.state = GLState()
+        self.calls = 0
+
+    @staticmethod
+    def sort_key(mesh: Mesh) -> tuple:
+        m = mesh.material
+        return m.program, tuple(u.data[0] for u in m.uniforms.values() if u.data_type is Uniform.Type.SAMPLER2D), id(m)
 
     @staticmethod
-    def render(scene: Scene, camera: Camera):
+    def queue(scene: Scene) -> list[Mesh]:
+        meshes = [obj for obj in scene.descendants() if isinstance(obj, Mesh) and obj.visible]
+        opaque = sorted((m for m in meshes if not m.material.settings["blended"]), key = Renderer.sort_key)
+        return opaque + [m for m in meshes if m.material.settings["blended"]]
+
+    def render(self, scene: Scene, camera: Camera):
+        with timer("frame render"):
+            self._render(scene, camera)
+        count("gl calls", self.calls)
+
+    def _render(self, scene: Scene, camera: Camera):
+        state = self.state
+        state.reset()
+        state.calls = 1
         GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
+        scene.update_transforms()
         camera.update_view()
-        for obj in scene.descendants():
-            if isinstance(obj, Mesh) and obj.visible:
-                GL.glUseProgram(obj.material.program)
-                GL.glBindVertexArray(obj.vao)
-                obj.material.uniforms["modelMatrix"].data = obj.global_transform()
-                obj.material.uniforms["viewMatrix"].data = camera.view
-                obj.material.uniforms["projectionMatrix"].data = camera.projection
-                for u in obj.material.uniforms.values():
-                    u.upload_data()
-                obj.material.render_settings()
-                GL.glDrawArrays(obj.material.settings["drawStyle"], 0, obj.geometry.vertex_count)
+        CAMERA.set("projectionMatrix", camera.projection)
+        CAMERA.set("viewMatrix", camera.view)
+        CAMERA.upload(state)
+        material = None
+        programs = set()
+        for obj in Renderer.queue(scene):
+            if obj.material is not material:
+                material = obj.material
+                state.use_program(material.program)
+                if material.program not in programs and "viewMatrix" in material.uniforms:
+                    programs.add(material.program)
+                    material.uniforms["viewMatrix"].data = camera.view
+                    material.uniforms["projectionMatrix"].data = camera.projection
+                    for name in Renderer.FRAME_UNIFORMS:
+                        Renderer._upload(state, material.uniforms[name])
+                for name, u in material.uniforms.items():
+                    if name != "modelMatrix" and name not in Renderer.FRAME_UNIFORMS:
+                        Renderer._upload(state, u)
+                material.render_settings(state)
+            state.bind_vertex_array(obj.vao)
+            model = material.uniforms["modelMatrix"]
+            model.data = obj.global_transform()
+            Renderer._upload(state, model)
+            if obj.geometry.indices is None:
+                GL.glDrawArrays(material.settings["drawStyle"], 0, obj.geometry.vertex_count)
+            else:
+                GL.glDrawElements(material.settings["drawStyle"], len(obj.geometry.indices), obj.geometry.index_type, None)
+            state.calls += 1
+        self.calls = state.calls
+
+    @staticmethod
+    def _upload(state: GLState, uniform: Uniform):
+        if uniform.data_type is Uniform.Type.SAMPLER2D:
+            texture, unit = uniform.data
+            state.bind_texture(unit, texture)
+            GL.glUniform1i(uniform.var, unit)
+        else:
+            uniform.upload_data()
+        state.calls += 1
 
 class Controller(Object3d):
     class Moves(Enum):
@@ -139,8 +351,7 @@ class Controller(Object3d):
     def __init__(self, keys: dict[Moves, str|None] = None, move_speed: float = 1, turn_speed = pi / 3, local = True):
         super().__init__()
         self.looker = Object3d()
-        self.children.append(self.looker)
-        self.looker.parent = self
+        Object3d.add(self, self.looker)
         if keys is None:
             self.keys = {}
         else:
@@ -12,7 +12,14 @@ def compile_shader(code: str, shader_type: Constant):
         raise SyntaxError("Shader Error:\n" + message.decode("utf-8"))
     return ref
 
+_PROGRAMS: dict[tuple[str, str], int] = {}
+
+def clear_programs():
+    _PROGRAMS.clear()
+
 def initialize_program(vs_code: str, fs_code: str):
+    if (vs_code, fs_code) in _PROGRAMS:
+        return _PROGRAMS[vs_code, fs_code]
     vsID = compile_shader(vs_code, GL_VERTEX_SHADER)
     fgID = compile_shader(fs_code, GL_FRAGMENT_SHADER)
     programID = glCreateProgram()
@@ -23,4 +30,76 @@ def initialize_program(vs_code: str, fs_code: str):
         message = glGetProgramInfoLog(programID)
         glDeleteProgram(programID)
         raise RuntimeError("GL Program Error:\n" + message.decode("utf-8"))
-    return programID
\ No newline at end of file
+    _PROGRAMS[vs_code, fs_code] = programID
+    return programID
+
+class GLState:
+    def __init__(self):
+        self.calls = 0
+        self.reset()
+
+    def reset(self):
+        self.program = None
+        self.vao = None
+        self.active_texture = None
+        self.textures: dict[int, int] = {}
+        self.caps: dict[int, bool] = {}
+        self.polygon_mode = None
+        self.line_width = None
+        self.point_size = None
+        self.front_face = None
+
+    def use_program(self, program):
+        if program != self.program:
+            glUseProgram(program)
+            self.program = program
+            self.calls += 1
+
+    def bind_vertex_array(self, vao):
+        if vao != self.vao:
+            glBindVertexArray(vao)
+            self.vao = vao
+            self.calls += 1
+
+    def bind_texture(self, unit: int, texture):
+        if self.textures.get(unit) != texture:
+            if unit != self.active_texture:
+                glActiveTexture(GL_TEXTURE0 + unit)
+                self.active_texture = unit
+                self.calls += 1
+            glBindTexture(GL_TEXTURE_2D, texture)
+            self.textures[unit] = texture
+            self.calls += 1
+
+    def enable(self, cap: Constant, on: bool = True):
+        if self.caps.get(cap) is not on:
+            if on:
+                glEnable(cap)
+            else:
+                glDisable(cap)
+            self.caps[cap] = on
+            self.calls += 1
+
+    def set_polygon_mode(self, mode: Constant):
+        if mode != self.polygon_mode:
+            glPolygonMode(GL_FRONT_AND_BACK, mode)
+            self.polygon_mode = mode
+            self.calls += 1
+
+    def set_line_width(self, width: float):
+        if width != self.line_width:
+            glLineWidth(width)
+            self.line_width = width
+            self.calls += 1
+
+    def set_point_size(self, size: float):
+        if size != self.point_size:
+            glPointSize(size)
+            self.point_size = size
+            self.calls += 1
+
+    def set_front_face(self, face: Constant):
+        if face != self.front_face:
+            glFrontFace(face)
+            self.front_face = face
+            self.calls += 1
\ No newline at end of file
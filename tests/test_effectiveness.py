@@ -0,0 +1,26 @@
+import numpy as np
+import objects
+from objects import effectiveness, TYPES
+import pytest
+
+def test_trailing_axis_is_types():
+    fire, grass, water, rock = (TYPES[n].id for n in ("Fire", "Grass", "Water", "Rock"))
+    assert effectiveness(fire, [grass, water, rock]) == 0.5
+    assert effectiveness([fire], [grass, water, rock]).tolist() == [0.5]
+    assert effectiveness([fire], [[grass], [water], [rock]]).tolist() == [2, 0.5, 0.5]
+    assert effectiveness(fire, [grass, -1]) == 2
+
+def test_scalar_defender_rejected():
+    with pytest.raises(ValueError):
+        effectiveness(0, 0)
+
+def test_matches_ptype_effectiveness():
+    types = list(TYPES.values())
+    n = len(types)
+    a, d1, d2 = np.meshgrid(np.arange(n), np.arange(n), np.arange(-1, n), indexing = "ij")
+    batch = effectiveness(a, np.stack((d1, d2), axis = -1))
+    for i in range(n):
+        for j in range(n):
+            assert batch[i, j, 0] == types[i].effectiveness(types[j])
+            for k in range(n):
+                assert batch[i, j, k + 1] == types[i].effectiveness(types[j], types[k])
\ No newline at end of file
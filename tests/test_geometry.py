@@ -0,0 +1,48 @@
+from benchmarks.gl import stub_gl
+from math import sin
+import numpy as np
+from OpenGL import GL
+import pytest
+from render.geometry import Box, Parametric, Plane, Sphere, weld
+
+def test_weld_keeps_first_seen_order():
+    indices, (p,) = weld([(2, 0), (1, 0), (2, 0), (0, 0), (1, 0)])
+    assert indices.tolist() == [0, 1, 0, 2, 1]
+    assert p.tolist() == [[2, 0], [1, 0], [0, 0]]
+
+def test_weld_merges_negative_zero():
+    indices, (p,) = weld([(0.0, 1), (-0.0, 1)])
+    assert indices.tolist() == [0, 0] and len(p) == 1
+
+def test_weld_rebuilds_input():
+    rng = np.random.default_rng(0)
+    pos = rng.integers(0, 3, (200, 3)).astype(np.float32)
+    uv = rng.integers(0, 2, (200, 2)).astype(np.float32)
+    indices, (p, t) = weld(pos, uv)
+    assert len(p) < len(pos)
+    assert (p[indices] == pos).all() and (t[indices] == uv).all()
+
+def test_counts_and_index_type():
+    with stub_gl():
+        box = Box()
+        plane = Plane(w_sub = 4, h_sub = 3)
+        sphere = Sphere(ur = 300, vr = 300)
+    assert (box.vertex_count, len(box.indices)) == (20, 36)
+    assert (plane.vertex_count, len(plane.indices)) == (20, 72)
+    assert (sphere.vertex_count, len(sphere.indices)) == (301 * 301, 300 * 300 * 6)
+    assert box.indices.dtype == plane.indices.dtype == np.uint16
+    assert box.index_type == plane.index_type == GL.GL_UNSIGNED_SHORT
+    assert sphere.indices.dtype == np.uint32 and sphere.index_type == GL.GL_UNSIGNED_INT
+    assert sphere.indices.max() == sphere.vertex_count - 1
+
+def test_scalar_func_needs_opt_in():
+    def scalar(u: float, v: float):
+        return sin(u), v, 0
+    def vectorized(u: np.ndarray, v: np.ndarray):
+        return np.sin(u), v, 0
+    with stub_gl():
+        with pytest.raises(TypeError):
+            Parametric(0, 1, 4, 0, 1, 4, scalar)
+        a = Parametric(0, 1, 4, 0, 1, 4, scalar, vectorized = False)
+        b = Parametric(0, 1, 4, 0, 1, 4, vectorized)
+    assert np.allclose(a.vertex_buffer.data, b.vertex_buffer.data)
\ No newline at end of file
@@ -0,0 +1,25 @@
+import os
+from benchmarks import write_moves
+from benchmarks.memory import allocated, factories
+from objects import _objects
+import pytest
+from util import parse_pyk
+
+COUNT = 10_000
+
+CEILINGS = {"PType": 200, "Stat": 130, "Nature": 360, "Gender": 220, "Group": 210, "LevelingRate": 260, "MoveCategory": 100}
+
+@pytest.mark.parametrize("name", CEILINGS)
+def test_per_object_size(name: str):
+    factory = factories()[name]
+    obj = factory()
+    assert not hasattr(obj, "__dict__")
+    assert allocated(lambda: [factory() for _ in range(COUNT)]) / COUNT <= CEILINGS[name]
+
+def test_move_table_size(tmp_path):
+    path = os.path.join(tmp_path, "moves.pyk")
+    write_moves(path, COUNT)
+    rows = parse_pyk(path)
+    table = _objects.MoveTable(rows[:1])
+    assert not hasattr(table.moves[0], "__dict__")
+    assert allocated(lambda: _objects.MoveTable(rows)) / COUNT <= 200
\ No newline at end of file
@@ -0,0 +1,40 @@
+import objects
+import pytest
+from util import load_pyk, parse_pyk, PykError
+
+def write(tmp_path, text: str) -> str:
+    path = tmp_path / "test.pyk"
+    path.write_text(text, encoding = "UTF-8")
+    return str(path)
+
+def test_field_count_reports_line(tmp_path):
+    path = write(tmp_path, "Pound|Normal|Physical|35|40|100|14\n\nTackle|Normal|Physical\n")
+    with pytest.raises(PykError) as e:
+        parse_pyk(path, objects._FIELDS["pyk/moves.pyk"])
+    assert e.value.filename == path
+    assert e.value.line == 3
+
+def test_field_count_checked_on_cached_rows(tmp_path):
+    path = write(tmp_path, "Fire|F08030\nWater\n")
+    load_pyk(path)
+    with pytest.raises(PykError) as e:
+        load_pyk(path, (2, 2))
+    assert e.value.line == 2
+
+def test_quotes_are_literal(tmp_path):
+    path = write(tmp_path, 'Farfetch"d|A8A878\n"Quoted" name|F08030\n"Open|705848\nNext|F8D030\n')
+    assert parse_pyk(path) == (('Farfetch"d', "A8A878"), ('"Quoted" name', "F08030"), ('"Open', "705848"), ("Next", "F8D030"))
+
+def test_trailing_backslash_rejected(tmp_path):
+    path = write(tmp_path, "Fire|F08030\nWater\\\n|6890F0\n")
+    with pytest.raises(PykError) as e:
+        parse_pyk(path)
+    assert e.value.line == 2
+    path = write(tmp_path, "Fire|F08030\\")
+    with pytest.raises(PykError) as e:
+        parse_pyk(path)
+    assert e.value.line == 1
+
+def test_escaped_delimiter(tmp_path):
+    path = write(tmp_path, "a\\|b|c\n")
+    assert parse_pyk(path, (2, 2)) == (("a|b", "c"),)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import io
+import objects
+import pytest
+import shutil
+
+@pytest.fixture
+def pyk(tmp_path, monkeypatch):
+    shutil.copytree("pyk", tmp_path / "pyk")
+    monkeypatch.chdir(tmp_path)
+    g = vars(objects)
+    saved = {n: g.pop(n) for n in objects._REGISTRIES if n in g}
+    yield tmp_path / "pyk"
+    for n in objects._REGISTRIES:
+        g.pop(n, None)
+    g.update(saved)
+
+def edit(path, f):
+    text = f(path.read_text(encoding = "UTF-8"))
+    path.write_text(text, encoding = "UTF-8")
+
+def test_cell_edit_keeps_identities(pyk):
+    types = objects.TYPES
+    normal = types["Normal"]
+    chart = objects._PADDED_TYPE_CHART
+    objects.TYPE_CHART
+    moves = objects.MOVES
+    pound = moves["Pound"]
+    table = objects.MOVE_TABLE
+    i = normal.id
+    rows = (pyk / "type/table.pyk").read_text(encoding = "UTF-8").split("\n")
+    rows[i] = rows[i][:i] + "2" + rows[i][i + 1:]
+    (pyk / "type/table.pyk").write_text("\n".join(rows), encoding = "UTF-8")
+    edit(pyk / "moves.pyk", lambda s: s.replace("Pound|Normal|Physical|35|40|", "Pound|Normal|Physical|35|45|"))
+    assert set(objects.reload("pyk/type/table.pyk", "pyk/moves.pyk")) == {"_PADDED_TYPE_CHART", "TYPE_CHART", "MOVE_TABLE", "MOVES"}
+    assert objects.TYPES is types and types["Normal"] is normal
+    assert objects._PADDED_TYPE_CHART is chart and normal.chart.base is chart
+    assert normal.effectiveness(normal) == 2
+    assert objects.MOVES is moves and objects.MOVE_TABLE is table and moves["Pound"] is pound
+    assert pound.power == 45 and pound.table is table
+
+def test_reordered_and_added_moves_keep_views(pyk):
+    views = dict(objects.MOVES)
+    table = objects.MOVE_TABLE
+    lines = (pyk / "moves.pyk").read_text(encoding = "UTF-8").split("\n")
+    lines[0], lines[1] = lines[1], lines[0]
+    lines.append("Test Move|Fire|Special|5|90|100|14")
+    (pyk / "moves.pyk").write_text("\n".join(lines), encoding = "UTF-8")
+    assert objects.reload("pyk/moves.pyk") == ["MOVE_TABLE", "MOVES"]
+    assert objects.MOVE_TABLE is table
+    for n, v in views.items():
+        assert objects.MOVES[n] is v and v.name == n and v.table is table
+        assert table.moves[v.index] is v
+    added = objects.MOVES["Test Move"]
+    assert table.moves[added.index] is added and added.table is table
+    assert added.type is objects.TYPES["Fire"] and added.power == 90
+
+def test_failed_edit_leaves_registries(pyk, monkeypatch):
+    err = io.StringIO()
+    monkeypatch.setattr(objects, "stderr", err)
+    watcher = objects.Watcher()
+    objects.TYPE_CHART, objects.MOVES
+    types = dict(objects.TYPES)
+    chart = objects._PADDED_TYPE_CHART.copy()
+    edit(pyk / "type/ptypes.pyk", lambda s: s + "\nStellar |44AACC")
+    with pytest.raises(ValueError):
+        objects.reload("pyk/type/ptypes.pyk")
+    assert dict(objects.TYPES) == types and (objects._PADDED_TYPE_CHART == chart).all()
+    assert all(t.chart is not None and len(t.eff) == len(types) for t in types.values())
+    assert watcher.poll() == [] and "failed" in err.getvalue()
+    assert watcher.poll() == [] and err.getvalue().count("failed") == 1
+    edit(pyk / "type/table.pyk", lambda s: "\n".join(r + "1" for r in s.split("\n")) + "\n" + "1" * 20)
+    assert set(watcher.poll()) == {"TYPES", "_PADDED_TYPE_CHART", "TYPE_CHART", "MOVE_TABLE", "MOVES"}
+    assert len(objects.TYPES) == 20 and objects.TYPE_CHART.shape == (20, 20)
+    assert objects.TYPES["Stellar"].effectiveness(types["Fire"]) == 1
+    assert all(objects.TYPES[n] is t for n, t in types.items())
+    assert watcher.poll() == []
\ No newline at end of file
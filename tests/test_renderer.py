@@ -0,0 +1,52 @@
+from benchmarks.gl import stub_gl
+from collections import Counter
+from render import Texture
+from render.geometry import Box
+from render.materials import CAMERA, SurfaceBasicMaterial, TextureMaterial
+from render.objects import Camera, Mesh, Renderer, Scene
+from render.openGL_util import _PROGRAMS
+
+def frame(renderer: Renderer, scene: Scene, camera: Camera, calls: Counter) -> Counter:
+    renderer.render(scene, camera)
+    calls.clear()
+    renderer.render(scene, camera)
+    assert renderer.calls == sum(calls.values())
+    return Counter(calls)
+
+def test_calls_counted_and_shared_material_is_free():
+    with stub_gl() as calls:
+        renderer = Renderer()
+        camera = Camera()
+        scene = Scene()
+        scene.add(camera)
+        geometry = Box()
+        material = SurfaceBasicMaterial()
+        scene.add(Mesh(geometry, material))
+        one = frame(renderer, scene, camera, calls)
+        scene.add(Mesh(geometry, material))
+        two = frame(renderer, scene, camera, calls)
+    extra = two - one
+    assert extra == Counter({"glBindVertexArray": 1, "glUniformMatrix4fv": 1, "glDrawElements": 1})
+    assert one["glUseProgram"] == two["glUseProgram"] == 1
+
+def test_blended_meshes_keep_scene_order():
+    with stub_gl():
+        scene = Scene()
+        geometry = Box()
+        first = Mesh(geometry, TextureMaterial(Texture()))
+        opaque = Mesh(geometry, SurfaceBasicMaterial())
+        second = Mesh(geometry, TextureMaterial(Texture()))
+        for m in (second, opaque, first):
+            scene.add(m)
+    assert Renderer.queue(scene) == [opaque, second, first]
+
+def test_stub_leaves_no_fake_gl_state():
+    with stub_gl():
+        renderer = Renderer()
+        camera = Camera()
+        scene = Scene()
+        scene.add(camera)
+        scene.add(Mesh(Box(), SurfaceBasicMaterial()))
+        renderer.render(scene, camera)
+        assert _PROGRAMS and CAMERA.buffer is not None
+    assert not _PROGRAMS and CAMERA.buffer is None
\ No newline at end of file
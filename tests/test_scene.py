@@ -0,0 +1,73 @@
+import numpy as np
+from random import Random
+from benchmarks.gl import stub_gl
+from render import Texture
+from render.geometry import Rectangle
+from render.materials import TextureMaterial
+from render.objects import Group, Mesh, Renderer, Scene
+
+def build(flat: bool, seed: int = 0) -> list:
+    rng = Random(seed)
+    scene = Scene(flat = flat)
+    nodes = [scene]
+    for _ in range(200):
+        n = Group()
+        rng.choice(nodes).add(n)
+        nodes.append(n)
+    for _ in range(500):
+        n = rng.choice(nodes[1:])
+        op = rng.randrange(6)
+        if op == 0:
+            n.translate(rng.random(), rng.random(), rng.random())
+        elif op == 1:
+            n.y_rotation(rng.random(), local = False)
+        elif op == 2:
+            n.scale(1 + rng.random() / 10)
+        elif op == 3:
+            n.set_position(rng.random(), 0, rng.random())
+        elif op == 4:
+            p = n.parent
+            p.remove(n)
+            q = rng.choice(nodes)
+            a = q
+            while a is not None and a is not n:
+                a = a.parent
+            (q if a is None else p).add(n)
+        if rng.random() < 0.2:
+            scene.update_transforms()
+    scene.update_transforms()
+    return nodes
+
+def test_flat_matches_tree():
+    for tree, flat in zip(build(False), build(True)):
+        assert np.allclose(tree.global_transform(), flat.global_transform(), atol = 1e-3)
+        assert np.allclose(tree.local_transform, flat.local_transform, atol = 1e-4)
+
+def test_flat_transforms_accumulate():
+    scene = Scene(flat = True)
+    a = Group()
+    scene.add(a)
+    a.translate(1, 0, 0)
+    a.translate(1, 0, 0)
+    assert a.get_position() == (2, 0, 0)
+    a.set_position(5, 0, 0)
+    a.translate(1, 0, 0)
+    assert a.get_position() == (6, 0, 0)
+    scene.remove(a)
+    assert a.get_position() == (6, 0, 0)
+
+def test_flat_keeps_depth_first_order():
+    with stub_gl():
+        geometry = Rectangle()
+        queues = []
+        for flat in (False, True):
+            scene = Scene(flat = flat)
+            group = Group()
+            a = Mesh(geometry, TextureMaterial(Texture()))
+            b = Mesh(geometry, TextureMaterial(Texture()))
+            group.add(a)
+            scene.add(group)
+            scene.add(b)
+            assert scene.descendants() == [scene, group, a, b]
+            queues.append(Renderer.queue(scene) == [a, b])
+    assert queues == [True, True]
\ No newline at end of file
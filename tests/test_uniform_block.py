@@ -0,0 +1,35 @@
+import numpy as np
+from render import Uniform, UniformBlock
+from render.materials import CAMERA
+
+T = Uniform.Type
+
+def test_offsets_and_padding():
+    b = UniformBlock("X", {"a": T.FLOAT, "b": T.VEC3, "c": T.FLOAT, "d": T.VEC4, "e": T.MAT4, "f": T.VEC2, "g": T.INT})
+    assert b.offsets == {"a": 0, "b": 16, "c": 28, "d": 32, "e": 48, "f": 112, "g": 120}
+    assert b.size == 128
+    assert b.data.nbytes == b.size
+
+def test_size_rounds_to_16():
+    assert UniformBlock("X", {"a": T.FLOAT}).size == 16
+    assert UniformBlock("X", {"a": T.VEC3, "b": T.VEC2}).size == 32
+    assert UniformBlock("X", {"a": T.MAT4, "b": T.FLOAT}).size == 80
+
+def test_mat4_is_column_major():
+    b = UniformBlock("X", {"a": T.VEC3, "m": T.MAT4})
+    m = np.arange(16.0).reshape(4, 4)
+    b.set("m", m)
+    o = b.offsets["m"] // 4
+    assert b.data[o:o + 16].reshape(4, 4).tolist() == m.T.tolist()
+
+def test_vectors_and_int():
+    b = UniformBlock("X", {"a": T.FLOAT, "v": T.VEC3, "i": T.INT})
+    b.set("v", (1, 2, 3))
+    b.set("i", 7)
+    assert b.data[4:7].tolist() == [1, 2, 3]
+    assert b.data.view(np.int32)[b.offsets["i"] // 4] == 7
+    assert b.data[0] == 0
+
+def test_camera_block():
+    assert CAMERA.offsets == {"projectionMatrix": 0, "viewMatrix": 64}
+    assert CAMERA.size == 128
\ No newline at end of file
@@ -0,0 +1,54 @@
+from benchmarks.gl import stub_gl
+import numpy as np
+import pytest
+import render
+from render import Attribute, VertexBuffer, VertexLayout
+
+LAYOUT = VertexLayout({"vertexPosition": Attribute.Type.VEC3, "vertexUV": Attribute.Type.VEC2, "vertexWeight": Attribute.Type.FLOAT})
+
+def test_offsets_and_stride():
+    assert LAYOUT.offsets == {"vertexPosition": 0, "vertexUV": 3, "vertexWeight": 5}
+    assert LAYOUT.components == 6 and LAYOUT.stride == 24
+    assert LAYOUT.columns("vertexUV") == slice(3, 5)
+
+def test_pack_interleaves():
+    packed = LAYOUT.pack({"vertexPosition": [(1, 2, 3), (4, 5, 6)], "vertexUV": [(7, 8), (9, 10)], "vertexWeight": [11, 12]})
+    assert packed.dtype == np.float32 and packed.tolist() == [[1, 2, 3, 7, 8, 11], [4, 5, 6, 9, 10, 12]]
+
+def test_pack_rejects_mismatches():
+    with pytest.raises(ValueError):
+        LAYOUT.pack({"vertexPosition": [(1, 2, 3), (4, 5, 6)], "vertexUV": [(7, 8)], "vertexWeight": [11, 12]})
+    with pytest.raises(KeyError):
+        LAYOUT.pack({"vertexPosition": [(1, 2, 3)], "vertexUV": [(7, 8)]})
+    with pytest.raises(KeyError):
+        LAYOUT.pack({"vertexPosition": [(1, 2, 3)], "vertexUV": [(7, 8)], "vertexColor": [1]})
+
+def test_check_rejects_bad_input():
+    with pytest.raises(TypeError):
+        LAYOUT.check(np.zeros((2, 6)))
+    with pytest.raises(TypeError):
+        LAYOUT.check(np.zeros((6, 2), np.float32).T)
+    with pytest.raises(ValueError):
+        LAYOUT.check(np.zeros(7, np.float32))
+
+def test_interleaved_input_is_not_copied():
+    data = np.arange(12, dtype = np.float32).reshape(2, 6)
+    with stub_gl():
+        from_array = VertexBuffer(LAYOUT, data)
+        from_view = VertexBuffer(LAYOUT, memoryview(data.ravel()))
+    assert np.shares_memory(from_array.data, data) and np.shares_memory(from_view.data, data)
+    assert len(from_array) == len(from_view) == 2
+    assert from_array.attribute("vertexUV").tolist() == [[3, 4], [9, 10]]
+
+def test_update_uploads_changed_rows(monkeypatch):
+    data = np.zeros((4, 6), np.float32)
+    uploads = []
+    with stub_gl() as calls:
+        vb = VertexBuffer(LAYOUT, data)
+        with monkeypatch.context() as m:
+            m.setattr(render, "glBufferSubData", lambda target, offset, size, rows: uploads.append((offset, size, rows.tolist())))
+            vb.update(1, 3, vertexUV = [(1, 2), (3, 4)])
+            vb.update(vertexWeight = [5, 6, 7, 8])
+    assert uploads[0] == (24, 48, [[0, 0, 0, 1, 2, 0], [0, 0, 0, 3, 4, 0]])
+    assert uploads[1][:2] == (0, 96)
+    assert data[:, 5].tolist() == [5, 6, 7, 8] and calls["glBufferData"] == 1
\ No newline at end of file
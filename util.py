@@ -1,19 +1,106 @@
-from csv import reader
-from functools import reduce
+from concurrent.futures import ProcessPoolExecutor
+from csv import Error, QUOTE_NONE, reader
+from fractions import Fraction
+from functools import cache, lru_cache, reduce
 from operator import truediv
+from instrument import timer
+import marshal
+import os
 from pygame.color import Color
+from typing import Iterator
 from unicodedata import numeric
 
-def parse_pyk(filename: str) -> tuple[tuple[str | None, ...], ...]:
-    with open(filename, encoding = "UTF-8") as f:
-        return tuple(filter(lambda v: v is not None, (tuple(e.strip() or None for e in row) if len(row) > 1 else tuple(e.strip() for e in row[0]) if len(row) == 1 else None for row in reader(f.readlines(), delimiter='|', escapechar='\\'))))
+CACHE_VERSION = 2
 
-def parse_fraction(frac: str):
+class PykError(ValueError):
+    def __init__(self, message: str, filename: str, line: int):
+        super().__init__(f"{filename}, line {line}: {message}")
+        self.filename = filename
+        self.line = line
+
+def iter_pyk(filename: str, fields: tuple[int, int] | None = None) -> Iterator[tuple[str | None, ...]]:
+    with open(filename, encoding = "UTF-8", newline = "") as f:
+        rows = reader(f, delimiter='|', escapechar='\\', quoting = QUOTE_NONE, strict = True)
+        line = 1
+        try:
+            for row in rows:
+                if rows.line_num != line:
+                    raise PykError("line break escaped by a trailing backslash", filename, line)
+                if row:
+                    row = tuple(e.strip() or None for e in row) if len(row) > 1 else tuple(e.strip() for e in row[0])
+                    if fields is not None and not fields[0] <= len(row) <= fields[1]:
+                        expected = fields[0] if fields[0] == fields[1] else f"{fields[0]} to {fields[1]}"
+                        raise PykError(f"expected {expected} fields, got {len(row)}", filename, line)
+                    yield row
+                line = rows.line_num + 1
+        except Error as e:
+            raise PykError(str(e), filename, line) from e
+
+def parse_pyk(filename: str, fields: tuple[int, int] | None = None) -> tuple[tuple[str | None, ...], ...]:
+    return tuple(iter_pyk(filename, fields))
+
+def _cache_path(filename: str) -> str:
+    head, tail = os.path.split(filename)
+    return os.path.join(head, "__pycache__", tail + ".marshal")
+
+def load_pyk(filename: str, fields: tuple[int, int] | None = None) -> tuple[tuple[str | None, ...], ...]:
+    with timer(f"parse {filename}"):
+        rows = _load_pyk(filename)
+    if fields is not None and any(not fields[0] <= len(r) <= fields[1] for r in rows):
+        parse_pyk(filename, fields)
+    return rows
+
+def _load_pyk(filename: str) -> tuple[tuple[str | None, ...], ...]:
+    st = os.stat(filename)
+    key = (CACHE_VERSION, os.path.abspath(filename), st.st_size, st.st_mtime_ns)
+    cache = _cache_path(filename)
+    try:
+        with open(cache, "rb") as f:
+            cached, rows = marshal.loads(f.read())
+        if cached == key:
+            return rows
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    rows = parse_pyk(filename)
+    tmp = f"{cache}.{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok = True)
+        with open(tmp, "wb") as f:
+            marshal.dump((key, rows), f)
+        os.replace(tmp, cache)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    return rows
+
+def load_pyks(filenames: list[str], workers: int | None = None, fields: dict[str, tuple[int, int]] | None = None) -> list[tuple[tuple[str | None, ...], ...]]:
+    workers = min(workers or os.cpu_count() or 1, len(filenames))
+    arities = [(fields or {}).get(f) for f in filenames]
+    if workers < 2:
+        return list(map(load_pyk, filenames, arities))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(load_pyk, filenames, arities))
+
+_GLYPHS = {"0": Fraction(0), "1": Fraction(1), "2": Fraction(2), "4": Fraction(4),
+           "⅛": Fraction(1, 8), "¼": Fraction(1, 4), "⅓": Fraction(1, 3), "½": Fraction(1, 2),
+           "⅔": Fraction(2, 3), "¾": Fraction(3, 4), "⅕": Fraction(1, 5), "⅙": Fraction(1, 6)}
+
+@lru_cache(maxsize = 1024)
+def parse_fraction(frac: str, exact: bool = False) -> float | Fraction:
+    if not exact:
+        return float(parse_fraction(frac, True))
+    try:
+        return _GLYPHS[frac]
+    except KeyError:
+        pass
     if len(frac) == 1:
-        return numeric(frac)
+        return Fraction(numeric(frac)).limit_denominator()
     else:
-        return reduce(truediv, map(int, frac.translate({8260: "/", 8543: "1/"}).split("/")))
+        return reduce(truediv, map(Fraction, map(int, frac.translate({8260: "/", 8543: "1/"}).split("/"))))
 
+@cache
 def colors(col: str):
     c = Color("#" + col)
     l = Color(int(c.r + (255 - c.r) * 0.35), int(c.g + (255 - c.g) * 0.35), int(c.b + (255 - c.b) * 0.35))